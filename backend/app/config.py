@@ -36,6 +36,7 @@ class Settings(BaseSettings):
     JACKETT_API_KEY: str = os.environ.get("JACKETT_API_KEY", "hypertube_jackett_api_key")
     TMDB_API_KEY: str = os.environ.get("TMDB_API_KEY", "")
     SUBDL_API_KEY: str = os.environ.get("SUBDL_API_KEY", "")
+    REDIS_URL: str = os.environ.get("REDIS_URL", "")
 
     class Config:
         env_file = ".env"
@@ -8,7 +8,17 @@ database_url = settings.DATABASE_URL
 if database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(database_url, echo=False)
+# Pool sized for concurrent requests plus the background sync tasks;
+# pre_ping/recycle drop connections Postgres has closed behind our back
+engine = create_async_engine(
+    database_url,
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Float, BigInteger, Boolean, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Float, BigInteger, Boolean, DateTime, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.database import Base
@@ -36,6 +36,8 @@ class WatchedFilm(Base):
     __tablename__ = "watched_films"
     __table_args__ = (
         UniqueConstraint("user_id", "imdb_id", name="uq_user_watched_film"),
+        # Serves the cleanup's per-film MAX(watched_at) as an index-only scan
+        Index("ix_watched_films_imdb_watched_at", "imdb_id", "watched_at"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
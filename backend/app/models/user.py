@@ -35,7 +35,7 @@ class User(Base):
     profile_picture = Column(String, nullable=True)  # URL to profile picture
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
     last_login = Column(DateTime(timezone=True), nullable=True)
 
     if password_hash is None and fortytwo_id is None and github_id is None and discord_id is None:
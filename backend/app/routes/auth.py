@@ -15,6 +15,7 @@ from app.schemas.auth import (
     TokenRequest,
 )
 from app.services.auth_service import AuthService
+from app.services.user_service import UserService
 from fastapi.security import OAuth2PasswordRequestForm
 import httpx
 import logging
@@ -89,11 +90,14 @@ async def token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
+    AuthService.upgrade_password_hash(user, password)
 
     user.last_login = datetime.now(timezone.utc)
     await db.commit()
+    # password_hash may have been rewritten above
+    UserService.invalidate_cached_user(user.id)
 
-    access_token, expires_at = AuthService.create_access_token(user.id)
+    access_token, expires_at = AuthService.create_access_token(user.id, user.username)
     return {"access_token": access_token, "token_type": "bearer", "expires_at": expires_at}
 
 
@@ -118,7 +122,7 @@ async def register(
     user = await AuthService.register_user(db, user_data)
 
     # Generate token
-    access_token, expires_at = AuthService.create_access_token(user.id)
+    access_token, expires_at = AuthService.create_access_token(user.id, user.username)
 
     return AuthResponse(
         user=UserResponse.model_validate(user),
@@ -145,7 +149,7 @@ async def login(
     user = await AuthService.login_user(db, login_data)
 
     # Generate token
-    access_token, expires_at = AuthService.create_access_token(user.id)
+    access_token, expires_at = AuthService.create_access_token(user.id, user.username)
 
     return AuthResponse(
         user=UserResponse.model_validate(user),
@@ -351,7 +355,7 @@ async def oauth_callback(
             profile_picture=user_info.get("profile_picture", "")
         )
 
-    jwt_token, expires_at = AuthService.create_access_token(user.id)
+    jwt_token, expires_at = AuthService.create_access_token(user.id, user.username)
 
     return AuthResponse(
         user=UserResponse.model_validate(user),
@@ -370,7 +374,6 @@ async def refresh_token(
     from jose import JWTError, jwt as jose_jwt
     from app.config import JWT_ALGORITHM
     from app.models.user import User
-    from sqlalchemy import select
     import uuid
 
     try:
@@ -392,10 +395,9 @@ async def refresh_token(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, uuid.UUID(user_id))
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
-    new_token, new_expires_at = AuthService.create_access_token(user.id)
+    new_token, new_expires_at = AuthService.create_access_token(user.id, user.username)
     return Token(access_token=new_token, expires_at=new_expires_at)
@@ -4,7 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.services.download_service import DownloadService
-from app.services.torrent_service import TorrentService
+from app.services.torrent_service import TorrentService, get_torrent_service
 from app.schemas.download import DownloadCreate, DownloadResponse, DownloadProgressResponse
 from app.models.user import User
 from app.security import get_current_user
@@ -89,13 +89,13 @@ async def get_download_files(
     download_id: str,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     List playable video files for a completed download.
     Returns filenames relative to /downloads, ready to pass to /api/v1/stream/{filename}.
     """
     from uuid import UUID
-    from app.services.torrent_service import TorrentService
 
     VIDEO_EXTS = {".mp4", ".mkv", ".avi", ".mov", ".wmv", ".m4v", ".webm"}
 
@@ -109,8 +109,7 @@ async def get_download_files(
         raise HTTPException(status_code=404, detail="Download not found")
 
     try:
-        async with TorrentService() as ts:
-            files = await ts.get_files(download.torrent_hash)
+        files = await ts.get_files(download.torrent_hash)
     except Exception as e:
         logger.error(f"Failed to list torrent files: {e}")
         raise HTTPException(status_code=500, detail="Could not fetch file list")
@@ -136,13 +135,13 @@ async def get_download_files(
 async def pause_torrent(
     torrent_hash: str,
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Pause a torrent by its hash.
     """
     try:
-        async with TorrentService() as ts:
-            await ts.pause(torrent_hash)
+        await ts.pause(torrent_hash)
     except Exception as e:
         logger.error(f"Failed to pause torrent {torrent_hash}: {e}")
         raise HTTPException(status_code=500, detail="Could not pause torrent")
@@ -153,13 +152,13 @@ async def pause_torrent(
 async def resume_torrent(
     torrent_hash: str,
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Resume a torrent by its hash.
     """
     try:
-        async with TorrentService() as ts:
-            await ts.resume(torrent_hash)
+        await ts.resume(torrent_hash)
     except Exception as e:
         logger.error(f"Failed to resume torrent {torrent_hash}: {e}")
         raise HTTPException(status_code=500, detail="Could not resume torrent")
@@ -171,6 +170,7 @@ async def delete_torrent(
     torrent_hash: str,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Delete a torrent from qBittorrent. Also cleans up download rows and films.
@@ -180,8 +180,7 @@ async def delete_torrent(
     from app.models.film import Film
 
     try:
-        async with TorrentService() as ts:
-            await ts.delete(torrent_hash, delete_files=True)
+        await ts.delete(torrent_hash, delete_files=True)
     except Exception as e:
         logger.error(f"Failed to delete torrent {torrent_hash}: {e}")
         raise HTTPException(status_code=500, detail="Could not delete torrent")
@@ -249,13 +248,13 @@ async def delete_torrent(
 async def recheck_torrent(
     torrent_hash: str,
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Force recheck a torrent by its hash.
     """
     try:
-        async with TorrentService() as ts:
-            await ts.recheck(torrent_hash)
+        await ts.recheck(torrent_hash)
     except Exception as e:
         logger.error(f"Failed to recheck torrent {torrent_hash}: {e}")
         raise HTTPException(status_code=500, detail="Could not recheck torrent")
@@ -265,13 +264,13 @@ async def recheck_torrent(
 async def reannounce_torrent(
     torrent_hash: str,
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Force reannounce a torrent to trackers by its hash.
     """
     try:
-        async with TorrentService() as ts:
-            await ts.reannounce(torrent_hash)
+        await ts.reannounce(torrent_hash)
     except Exception as e:
         logger.error(f"Failed to reannounce torrent {torrent_hash}: {e}")
         raise HTTPException(status_code=500, detail="Could not reannounce torrent")
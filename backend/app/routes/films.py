@@ -8,8 +8,8 @@ from app.models.user import User
 from app.models.download import Download
 from app.security import get_current_user
 from app.services.film_service import FilmService
-from app.services.torrent_service import TorrentService
-from app.services.tmdb_service import TmdbService
+from app.services.torrent_service import TorrentService, get_torrent_service
+from app.services.tmdb_service import TmdbService, get_tmdb_service
 from app.schemas.film import FilmResponse, WatchedFilmResponse, MarkWatchedRequest, UpdateProgressRequest, CommentResponse, CreateCommentRequest
 import logging
 
@@ -59,6 +59,7 @@ async def get_film_files(
     imdb_id: str,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Return playable video files for a film across ALL its associated torrents.
@@ -87,22 +88,21 @@ async def get_film_files(
     video_files = []
     seen_names: set[str] = set()
     try:
-        async with TorrentService() as ts:
-            for h in sorted(hashes):
-                files = await ts.get_files(h)
-                for f in files:
-                    name = f.get("name", "")
-                    if name in seen_names:
-                        continue
-                    ext = os.path.splitext(name)[1].lower()
-                    if ext in VIDEO_EXTS:
-                        seen_names.add(name)
-                        video_files.append({
-                            "name": name,
-                            "size": f.get("size", 0),
-                            "stream_url": f"/api/v1/stream/{name}",
-                            "torrent_hash": h,
-                        })
+        for h in sorted(hashes):
+            files = await ts.get_files(h)
+            for f in files:
+                name = f.get("name", "")
+                if name in seen_names:
+                    continue
+                ext = os.path.splitext(name)[1].lower()
+                if ext in VIDEO_EXTS:
+                    seen_names.add(name)
+                    video_files.append({
+                        "name": name,
+                        "size": f.get("size", 0),
+                        "stream_url": f"/api/v1/stream/{name}",
+                        "torrent_hash": h,
+                    })
     except Exception as e:
         logger.error(f"Failed to list torrent files for {imdb_id}: {e}")
         raise HTTPException(status_code=500, detail="Could not fetch file list")
@@ -220,6 +220,7 @@ async def get_film_torrents(
     imdb_id: str,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    ts: TorrentService = Depends(get_torrent_service),
 ):
     """
     Return all torrents associated with a film, each with live status
@@ -262,9 +263,8 @@ async def get_film_torrents(
     torrents = []
     if hashes:
         try:
-            async with TorrentService() as ts:
-                hashes_str = "|".join(hashes)
-                qbt_list = await ts.list_torrents(hashes=hashes_str)
+            hashes_str = "|".join(hashes)
+            qbt_list = await ts.list_torrents(hashes=hashes_str)
             qbt_map = {t["hash"].lower(): t for t in qbt_list}
 
             for h in sorted(hashes):
@@ -316,6 +316,7 @@ async def get_film_detail(
     imdb_id: str,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
+    tmdb_svc: TmdbService = Depends(get_tmdb_service),
 ):
     """
     Get detailed metadata for a film by IMDb ID.
@@ -328,7 +329,6 @@ async def get_film_detail(
     - available subtitles (translation languages from TMDB)
     - number of comments
     """
-    tmdb_svc = TmdbService()
     details = await tmdb_svc.get_by_imdb(imdb_id)
     if not details:
         raise HTTPException(status_code=404, detail="Film not found on TMDB")
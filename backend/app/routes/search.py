@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from guessit import guessit
 from app.services.jackett_service import JackettService
-from app.services.tmdb_service import TmdbService
+from app.services.tmdb_service import TmdbService, get_tmdb_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 jackett = JackettService()
-tmdb = TmdbService()
 
 # TMDB genre ID mapping
 _TMDB_GENRE_IDS: dict[str, int] = {
@@ -103,6 +102,7 @@ async def search_torrents(
 async def search_tmdb(
     query: str = Query(..., min_length=1),
     page:  int = Query(1, ge=1),
+    tmdb: TmdbService = Depends(get_tmdb_service),
 ):
     """
     Search TMDB by title. Returns movie/TV cards with poster + metadata.
@@ -118,6 +118,7 @@ async def browse_media(
     page:       int   = Query(1, ge=1),
     year:       int   = Query(None,      description="Exact release year e.g. 2024"),
     min_rating: float = Query(None,      description="Minimum vote average (0-10)"),
+    tmdb:       TmdbService = Depends(get_tmdb_service),
 ):
     """
     Browse popular movies via TMDB Discover.
@@ -162,18 +163,15 @@ async def _resolve_imdbid(tmdb_id: int) -> str | None:
     """
     Resolve a TMDB movie ID to an IMDb ID via /movie/{id}/external_ids.
     """
-    import httpx
+    tmdb = get_tmdb_service()
     try:
-        async with httpx.AsyncClient(timeout=8) as client:
-            resp = await tmdb._get(client, f"https://api.themoviedb.org/3/movie/{tmdb_id}/external_ids")
-            data = resp.json()
-            imdb_id = data.get("imdb_id")
-            if imdb_id:
-                return imdb_id
-            # Try TV show
-            resp = await tmdb._get(client, f"https://api.themoviedb.org/3/tv/{tmdb_id}/external_ids")
-            data = resp.json()
-            return data.get("imdb_id")
+        data = await tmdb._get(f"https://api.themoviedb.org/3/movie/{tmdb_id}/external_ids")
+        imdb_id = data.get("imdb_id")
+        if imdb_id:
+            return imdb_id
+        # Try TV show
+        data = await tmdb._get(f"https://api.themoviedb.org/3/tv/{tmdb_id}/external_ids")
+        return data.get("imdb_id")
     except Exception as e:
         logger.warning(f"Could not resolve TMDB {tmdb_id} to IMDb: {e}")
         return None
@@ -277,7 +275,7 @@ async def _guess_imdb_for_title(title: str) -> str | None:
     if cache_key in _guessit_cache:
         return _guessit_cache[cache_key]
 
-    imdb_id = await tmdb.find_imdb_by_title(movie_title, year)
+    imdb_id = await get_tmdb_service().find_imdb_by_title(movie_title, year)
     _guessit_cache[cache_key] = imdb_id
     return imdb_id
 
@@ -324,7 +322,10 @@ def _compute_match_quality(r: dict, target_imdbid: str | None) -> str:
 
 
 @router.get("/media/{imdb_id}")
-async def get_media_details(imdb_id: str):
+async def get_media_details(
+    imdb_id: str,
+    tmdb: TmdbService = Depends(get_tmdb_service),
+):
     imdb_id = imdb_id.strip()
     if not imdb_id.startswith("tt"):
         imdb_id = "tt" + imdb_id
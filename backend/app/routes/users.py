@@ -9,6 +9,7 @@ from app.schemas.user import (
     UserPrivateProfile,
     PasswordChange,
     UserListItem,
+    CurrentUserClaims,
 )
 from app.services.user_service import UserService
 from app.models.user import User
@@ -18,7 +19,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("", response_model=list[UserListItem])
 async def list_users(
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: CurrentUserClaims = Depends(UserService.get_current_user_claims),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -31,7 +32,7 @@ async def list_users(
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_current_user_info(
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: CurrentUserClaims = Depends(UserService.get_current_user_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -47,7 +48,7 @@ async def get_current_user_info(
 @router.get("/search/{username}", response_model=UserProfileResponse)
 async def search_user_by_username(
     username: str,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: CurrentUserClaims = Depends(UserService.get_current_user_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -69,7 +70,7 @@ async def search_user_by_username(
 @router.get("/{user_id}", response_model=UserProfileResponse)
 async def get_user_profile(
     user_id: UUID,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: CurrentUserClaims = Depends(UserService.get_current_user_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -87,7 +88,7 @@ async def get_user_profile(
 @router.patch("/me", response_model=UserPrivateProfile)
 async def update_my_profile(
     update_data: UserProfileUpdate,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: User = Depends(UserService.get_current_user_db),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -105,7 +106,7 @@ async def update_my_profile(
 @router.put("/me/password")
 async def change_password(
     password_data: PasswordChange,
-    current_user: User = Depends(UserService.get_current_user),
+    current_user: User = Depends(UserService.get_current_user_db),
     db: AsyncSession = Depends(get_db)
 ):
     """
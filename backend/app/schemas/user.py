@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional, Union
 from datetime import datetime
 import uuid
 
@@ -28,8 +28,7 @@ class UserPublicProfile(BaseModel):
     language: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserPrivateProfile(UserPublicProfile):
     email: str
@@ -42,18 +41,23 @@ class UserPrivateProfile(UserPublicProfile):
     discord_id: Optional[str] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserProfileResponse(BaseModel):
-    profile: dict
+    # Private first: a self-view must keep its private fields when validated
+    profile: Union[UserPrivateProfile, UserPublicProfile]
     visibility: str
     is_self: bool = False
 
 
+class CurrentUserClaims(BaseModel):
+    """Authenticated user built from JWT claims only (no database lookup)."""
+    id: uuid.UUID
+    username: Optional[str] = None
+
+
 class UserListItem(BaseModel):
     id: uuid.UUID
     username: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -7,14 +7,13 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.config import settings, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.database import get_db
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False) # used when we also accept a query-param token
 
@@ -38,7 +37,7 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ):
-    from app.models.user import User
+    from app.services.user_service import UserService
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,8 +61,7 @@ async def get_current_user(
         raise credentials_exception
 
     try:
-        result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-        user = result.scalar_one_or_none()
+        user = await UserService.get_cached_user(db, uuid.UUID(user_id))
         if user is None:
             logger.warning(f"User not found for id: {user_id}")
             raise credentials_exception
@@ -84,7 +82,7 @@ async def get_current_user_media(
     Used for streaming endpoints where browsers set video.src directly
     and cannot send an Authorization header.
     """
-    from app.models.user import User
+    from app.services.user_service import UserService
 
     token = token_header or token_query
 
@@ -108,8 +106,7 @@ async def get_current_user_media(
         raise credentials_exception
 
     try:
-        result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-        user = result.scalar_one_or_none()
+        user = await UserService.get_cached_user(db, uuid.UUID(user_id))
         if user is None:
             raise credentials_exception
         return user
@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import UUID
 import secrets
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists
 from fastapi import HTTPException, status
 from app.models.user import User, AuthProvider
 from app.schemas.auth import UserRegister, UserLogin, Token
@@ -14,7 +15,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt_sha256 pre-hashes with SHA-256 so passwords past bcrypt's 72-byte limit
+# aren't silently truncated; plain bcrypt hashes still verify and get upgraded
+pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+
+
+def _invalidate_cached_user(user_id: UUID):
+    """Drop a changed user from UserService's cache."""
+    # Imported here: user_service imports this module at load time
+    from app.services.user_service import UserService
+    UserService.invalidate_cached_user(user_id)
+
 
 class AuthService:
 
@@ -29,13 +40,22 @@ class AuthService:
         return pwd_context.verify(plain_password, hashed_password)
 
     @staticmethod
-    def create_access_token(user_id: str) -> tuple[str, int]:
+    def upgrade_password_hash(user: User, plain_password: str):
+        """Re-hash a just-verified password if it's stored with a deprecated scheme"""
+        if pwd_context.needs_update(user.password_hash):
+            user.password_hash = pwd_context.hash(plain_password)
+
+    @staticmethod
+    def create_access_token(user_id: str, username: Optional[str] = None) -> tuple[str, int]:
         """Create JWT access token. Returns (token, expires_at_epoch)."""
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode = {
             "sub": str(user_id),
             "exp": expire
         }
+        # Lets endpoints that only need id/username skip the users lookup
+        if username:
+            to_encode["username"] = username
         encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=JWT_ALGORITHM)
         return encoded_jwt, int(expire.timestamp())
 
@@ -49,18 +69,14 @@ class AuthService:
         """Register a new user with email/password"""
 
         # Check if email already exists
-        result = await db.execute(select(User).where(User.email == user_data.email))
-        existing_user = result.scalar_one_or_none()
-        if existing_user:
+        if await db.scalar(select(exists().where(User.email == user_data.email))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
         # Check if username already exists
-        result = await db.execute(select(User).where(User.username == user_data.username))
-        existing_username = result.scalar_one_or_none()
-        if existing_username:
+        if await db.scalar(select(exists().where(User.username == user_data.username))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
@@ -111,10 +127,13 @@ class AuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
+        AuthService.upgrade_password_hash(user, login_data.password)
 
         # Update last login
         user.last_login = datetime.now(timezone.utc)
         await db.commit()
+        # password_hash may have been rewritten above
+        _invalidate_cached_user(user.id)
 
         return user
 
@@ -165,6 +184,7 @@ class AuthService:
         user.reset_token = None
         user.reset_token_expires = None
         await db.commit()
+        _invalidate_cached_user(user.id)
 
     @staticmethod
     def verify_token(token: str) -> Optional[str]:
@@ -188,8 +208,7 @@ class AuthService:
                 detail="Invalid authentication credentials"
             )
 
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await db.get(User, UUID(user_id))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -201,14 +220,12 @@ class AuthService:
     @staticmethod
     async def _get_unique_username(db: AsyncSession, username: str) -> str:
         """Ensure username is unique by appending a suffix if needed."""
-        result = await db.execute(select(User).where(User.username == username))
-        if not result.scalar_one_or_none():
+        if not await db.scalar(select(exists().where(User.username == username))):
             return username
         counter = 1
         while True:
             candidate = f"{username}_{counter}"
-            result = await db.execute(select(User).where(User.username == candidate))
-            if not result.scalar_one_or_none():
+            if not await db.scalar(select(exists().where(User.username == candidate))):
                 return candidate
             counter += 1
 
@@ -231,6 +248,7 @@ class AuthService:
             if not user.fortytwo_id:
                 user.fortytwo_id = fortytwo_id
             await db.commit()
+            _invalidate_cached_user(user.id)
             return user
 
         # Create new user with unique username
@@ -271,6 +289,7 @@ class AuthService:
             if not user.github_id:
                 user.github_id = github_id
             await db.commit()
+            _invalidate_cached_user(user.id)
             return user
 
         # Create new user with unique username
@@ -311,6 +330,7 @@ class AuthService:
             if not user.discord_id:
                 user.discord_id = discord_id
             await db.commit()
+            _invalidate_cached_user(user.id)
             return user
 
         # Create new user with unique username
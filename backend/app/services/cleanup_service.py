@@ -2,117 +2,146 @@ import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select, delete as sql_delete, func as sa_func
+from sqlalchemy import Row, select, delete as sql_delete, func as sa_func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import AsyncSessionLocal
 from app.models.film import Film, WatchedFilm, Comment
 from app.models.download import Download
-from app.services.torrent_service import TorrentService
+from app.services.torrent_service import get_torrent_service
 
 logger = logging.getLogger(__name__)
 
 CLEANUP_STALE_DAYS = 30 # films unwatched for this many days get deleted
-CLEANUP_INTERVAL_SECONDS = 24 * 3600 # how often the check runs
+CLEANUP_INTERVAL_SECONDS = 24 * 3600 # longest gap between checks
+CLEANUP_MIN_DELAY_SECONDS = 3600 # shortest gap, so films expiring close together share a run
 
 
-async def cleanup_stale_films():
+def _as_utc(value: datetime) -> datetime:
+    """init.sql declares these columns TIMESTAMP (naive, stored as UTC): make them aware."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def cleanup_stale_films() -> datetime | None:
     """
     Find all films that haven't been watched in a long time and delete them, along with their torrents and related DB rows.
+    Returns when the next remaining film becomes stale (None if there are no films).
     """
     logger.info("[CLEANUP] Starting stale film cleanup …")
-    cutoff = datetime.now(timezone.utc) - timedelta(days=CLEANUP_STALE_DAYS)
+    # Computed by Postgres: compares correctly whether the columns are TIMESTAMP
+    # (init.sql) or TIMESTAMPTZ (create_all), without binding an aware datetime
+    # against a naive column
+    cutoff = sa_func.now() - timedelta(days=CLEANUP_STALE_DAYS)
 
     async with AsyncSessionLocal() as session:
-        # Find all films
-        all_films_result = await session.execute(select(Film))
-        all_films = all_films_result.scalars().all()
-
-        stale_films: list[Film] = []
-
-        for film in all_films:
-            # Most recent watch across ALL users
-            result = await session.execute(
-                select(sa_func.max(WatchedFilm.watched_at))
-                .where(WatchedFilm.imdb_id == film.imdb_id)
+        # Most recent watch per film across ALL users; never-watched films
+        # fall back to their creation date. Only the columns cleanup needs are fetched.
+        last_watched = (
+            select(
+                WatchedFilm.imdb_id,
+                sa_func.max(WatchedFilm.watched_at).label("last_watched"),
             )
-            last_watched = result.scalar_one_or_none()
-
-            if last_watched is not None:
-                # Ensure timezone-aware comparison
-                if last_watched.tzinfo is None:
-                    last_watched = last_watched.replace(tzinfo=timezone.utc)
-                if last_watched < cutoff:
-                    stale_films.append(film)
-            else:
-                # Never watched
-                created = film.created_at
-                if created is not None:
-                    if created.tzinfo is None:
-                        created = created.replace(tzinfo=timezone.utc)
-                    if created < cutoff:
-                        stale_films.append(film)
+            .group_by(WatchedFilm.imdb_id)
+            .subquery()
+        )
+        last_activity = sa_func.coalesce(last_watched.c.last_watched, Film.created_at)
+        result = await session.execute(
+            select(Film.id, Film.imdb_id, Film.title, Film.torrent_hash)
+            .outerjoin(last_watched, last_watched.c.imdb_id == Film.imdb_id)
+            .where(last_activity < cutoff)
+        )
+        stale_films = result.all()
 
         if not stale_films:
             logger.info("[CLEANUP] No stale films found.")
-            return
+        else:
+            logger.info(f"[CLEANUP] Found {len(stale_films)} stale film(s) to remove.")
 
-        logger.info(f"[CLEANUP] Found {len(stale_films)} stale film(s) to remove.")
+            await _delete_films_and_torrents(session, stale_films)
 
-        for film in stale_films:
-            await _delete_film_and_torrents(session, film)
+            await session.commit()
+            logger.info("[CLEANUP] Stale film cleanup complete.")
 
-        await session.commit()
-        logger.info("[CLEANUP] Stale film cleanup complete.")
+        # Oldest activity among the films that are left decides the next run
+        oldest = await session.scalar(
+            select(sa_func.min(last_activity))
+            .select_from(Film)
+            .outerjoin(last_watched, last_watched.c.imdb_id == Film.imdb_id)
+        )
+        if oldest is None:
+            return None
+        return _as_utc(oldest) + timedelta(days=CLEANUP_STALE_DAYS)
 
 
-async def _delete_film_and_torrents(session: AsyncSession, film: Film):
-    """Delete a single film's torrents from qBittorrent and clean up all DB rows."""
-    imdb_id = film.imdb_id
-    logger.info(f"[CLEANUP] Removing stale film: {film.title} ({imdb_id})")
-
-    # Collect all torrent hashes linked to this film (from downloads + film row)
-    hashes_to_delete: set[str] = set()
+async def _delete_films_and_torrents(session: AsyncSession, films: list[Row]):
+    """
+    Delete the given films' torrents from qBittorrent and clean up all their DB rows in bulk.
+    `films` are (id, imdb_id, title, torrent_hash) rows.
+    """
+    imdb_ids = [film.imdb_id for film in films]
+    for film in films:
+        logger.info(f"[CLEANUP] Removing stale film: {film.title} ({film.imdb_id})")
 
-    if film.torrent_hash:
-        hashes_to_delete.add(film.torrent_hash.lower())
+    # Collect all torrent hashes linked to these films (from downloads + film rows)
+    hashes_to_delete: set[str] = {film.torrent_hash.lower() for film in films if film.torrent_hash}
 
     dl_result = await session.execute(
-        select(Download.torrent_hash).where(Download.imdb_id == imdb_id)
+        select(Download.torrent_hash).where(Download.imdb_id.in_(imdb_ids))
     )
     for row in dl_result.all():
         if row[0]:
             hashes_to_delete.add(row[0].lower())
 
-    # Delete torrents from qBittorrent
-    for torrent_hash in hashes_to_delete:
-        try:
-            async with TorrentService() as ts:
-                await ts.delete(torrent_hash, delete_files=True)
+    # Delete torrents from qBittorrent, concurrently over the shared client
+    ts = get_torrent_service()
+    hashes = list(hashes_to_delete)
+    results = await asyncio.gather(
+        *(ts.delete(torrent_hash, delete_files=True) for torrent_hash in hashes),
+        return_exceptions=True,
+    )
+    for torrent_hash, result in zip(hashes, results):
+        if isinstance(result, Exception):
+            logger.warning(f"[CLEANUP] Could not delete torrent {torrent_hash}: {result}")
+        else:
             logger.info(f"[CLEANUP] Deleted torrent {torrent_hash}")
-        except Exception as e:
-            logger.warning(f"[CLEANUP] Could not delete torrent {torrent_hash}: {e}")
 
-    # Clean up DB rows
+    # Clean up DB rows: one statement per table for the whole batch
     await session.execute(
-        sql_delete(Download).where(Download.imdb_id == imdb_id)
+        sql_delete(Download).where(Download.imdb_id.in_(imdb_ids))
     )
     await session.execute(
-        sql_delete(WatchedFilm).where(WatchedFilm.imdb_id == imdb_id)
+        sql_delete(WatchedFilm).where(WatchedFilm.imdb_id.in_(imdb_ids))
     )
     await session.execute(
-        sql_delete(Comment).where(Comment.imdb_id == imdb_id)
+        sql_delete(Comment).where(Comment.imdb_id.in_(imdb_ids))
     )
     await session.execute(
-        sql_delete(Film).where(Film.id == film.id)
+        sql_delete(Film).where(Film.id.in_([film.id for film in films]))
     )
 
 
+def _next_check_delay(next_due: datetime | None, now: datetime) -> float:
+    """Seconds to sleep before the next run, clamped to the min/max check gap."""
+    if next_due is None:
+        return CLEANUP_INTERVAL_SECONDS
+    until_due = (_as_utc(next_due) - now).total_seconds()
+    return min(CLEANUP_INTERVAL_SECONDS, max(CLEANUP_MIN_DELAY_SECONDS, until_due))
+
+
 async def periodic_cleanup_task():
-    """Background loop that runs cleanup on a fixed interval."""
+    """
+    Background loop that runs cleanup when the next film is due to go stale,
+    rather than polling: at most every CLEANUP_INTERVAL_SECONDS, at least
+    CLEANUP_MIN_DELAY_SECONDS apart. Watches only push a film's due time later,
+    so an early wake-up finds nothing and simply reschedules.
+    """
     while True:
+        delay = CLEANUP_INTERVAL_SECONDS
         try:
-            await cleanup_stale_films()
+            delay = _next_check_delay(await cleanup_stale_films(), datetime.now(timezone.utc))
         except Exception as e:
             logger.error(f"[CLEANUP] Error during cleanup: {e}", exc_info=True)
-        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+        logger.info(f"[CLEANUP] Next check in {delay / 3600:.1f}h")
+        await asyncio.sleep(delay)
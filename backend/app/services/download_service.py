@@ -3,7 +3,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from app.models.download import Download, DownloadStatus
-from app.services.torrent_service import TorrentService
+from app.services.torrent_service import get_torrent_service, extract_infohash
 from app.services.film_service import FilmService
 
 logger = logging.getLogger(__name__)
@@ -50,37 +50,37 @@ class DownloadService:
                 return existing_download
 
         # Add to qBittorrent
-        async with TorrentService() as ts:
-            if magnet_link and torrent_hash:
-                success = await ts.add_magnet(
-                    magnet_link,
-                    category=f"hypertube-{user_id}",
-                    tags=f"user:{user_id}",
-                )
-                if not success:
-                    logger.error(f"Failed to add magnet: {magnet_link[:80]}…")
-                    raise Exception("Failed to add torrent to download client")
-            else:
-                # Fallback: download .torrent file and upload to qBittorrent
-                torrent_hash = await ts.add_torrent_url(
-                    torrent_url,
-                    category=f"hypertube-{user_id}",
-                    tags=f"user:{user_id}",
-                )
-                if not torrent_hash:
-                    logger.error(f"Failed to add torrent from URL: {torrent_url[:120]}…")
-                    raise Exception("Failed to add torrent file to download client")
+        ts = get_torrent_service()
+        if magnet_link and torrent_hash:
+            success = await ts.add_magnet(
+                magnet_link,
+                category=f"hypertube-{user_id}",
+                tags=f"user:{user_id}",
+            )
+            if not success:
+                logger.error(f"Failed to add magnet: {magnet_link[:80]}…")
+                raise Exception("Failed to add torrent to download client")
+        else:
+            # Fallback: download .torrent file and upload to qBittorrent
+            torrent_hash = await ts.add_torrent_url(
+                torrent_url,
+                category=f"hypertube-{user_id}",
+                tags=f"user:{user_id}",
+            )
+            if not torrent_hash:
+                logger.error(f"Failed to add torrent from URL: {torrent_url[:120]}…")
+                raise Exception("Failed to add torrent file to download client")
 
-                # Check for existing download now that we know the hash
-                existing = await session.execute(
-                    select(Download).where(
-                        and_(Download.user_id == user_id, Download.torrent_hash == torrent_hash)
-                    )
+            # Check for existing download now that we know the hash
+            existing = await session.execute(
+                select(Download).where(
+                    and_(Download.user_id == user_id, Download.torrent_hash == torrent_hash)
                 )
-                existing_download = existing.scalar_one_or_none()
-                if existing_download:
-                    logger.info(f"Download already exists for user {user_id}: {torrent_hash}")
-                    return existing_download
+            )
+            existing_download = existing.scalar_one_or_none()
+            if existing_download:
+                logger.info(f"Download already exists for user {user_id}: {torrent_hash}")
+                return existing_download
 
         # Create Download record
         download = Download(
@@ -126,12 +126,7 @@ class DownloadService:
         """
         Extract the torrent hash from a magnet link by parsing the xt parameter.
         """
-        if "xt=urn:btih:" in magnet_link:
-            try:
-                return magnet_link.split("xt=urn:btih:")[1].split("&")[0]
-            except IndexError:
-                pass
-        return None
+        return extract_infohash(magnet_link)
 
     async def get_user_downloads(self, session: AsyncSession, user_id: UUID) -> list[Download]:
         """
@@ -158,62 +153,62 @@ class DownloadService:
         Fetch current torrent status from qBittorrent and update the Download record.
         Also syncs the global films catalogue with live progress data.
         """
-        async with TorrentService() as ts:
-            progress = await ts.get_progress(download.torrent_hash)
-            if not progress:
+        ts = get_torrent_service()
+        progress = await ts.get_progress(download.torrent_hash)
+        if not progress:
+            download.status = DownloadStatus.ERROR
+            logger.warning(f"No progress info for {download.torrent_hash}")
+        else:
+            state = progress.get("state", "")
+
+            # Map qBittorrent states
+            COMPLETED_STATES = {"uploading", "forcedUP", "stalledUP", "queuedUP", "checkingUP",
+                                "pausedUP", "stoppedUP"}  # seeding paused = download done
+            DOWNLOADING_STATES = {
+                "downloading", "forcedDL", "metaDL", "allocating",
+                "stalledDL", "queuedDL", "checkingDL", "checkingResumeData", "moving"
+            }
+            PAUSED_STATES = {"pausedDL", "stoppedDL"}  # download paused
+            ERROR_STATES = {"error", "missingFiles", "unknown"}
+
+            if state in COMPLETED_STATES:
+                download.status = DownloadStatus.COMPLETED
+            elif state in DOWNLOADING_STATES:
+                download.status = DownloadStatus.DOWNLOADING
+            elif state in PAUSED_STATES:
+                download.status = DownloadStatus.PAUSED
+            elif state in ERROR_STATES:
                 download.status = DownloadStatus.ERROR
-                logger.warning(f"No progress info for {download.torrent_hash}")
+                logger.warning(f"Torrent {download.torrent_hash} in state: {state}")
             else:
-                state = progress.get("state", "")
-
-                # Map qBittorrent states
-                COMPLETED_STATES = {"uploading", "forcedUP", "stalledUP", "queuedUP", "checkingUP",
-                                    "pausedUP", "stoppedUP"}  # seeding paused = download done
-                DOWNLOADING_STATES = {
-                    "downloading", "forcedDL", "metaDL", "allocating",
-                    "stalledDL", "queuedDL", "checkingDL", "checkingResumeData", "moving"
-                }
-                PAUSED_STATES = {"pausedDL", "stoppedDL"}  # download paused
-                ERROR_STATES = {"error", "missingFiles", "unknown"}
-
-                if state in COMPLETED_STATES:
-                    download.status = DownloadStatus.COMPLETED
-                elif state in DOWNLOADING_STATES:
+                logger.warning(f"Unknown qBittorrent state '{state}' for {download.torrent_hash}")
+                if download.status not in (DownloadStatus.COMPLETED, DownloadStatus.ERROR):
                     download.status = DownloadStatus.DOWNLOADING
-                elif state in PAUSED_STATES:
-                    download.status = DownloadStatus.PAUSED
-                elif state in ERROR_STATES:
-                    download.status = DownloadStatus.ERROR
-                    logger.warning(f"Torrent {download.torrent_hash} in state: {state}")
-                else:
-                    logger.warning(f"Unknown qBittorrent state '{state}' for {download.torrent_hash}")
-                    if download.status not in (DownloadStatus.COMPLETED, DownloadStatus.ERROR):
-                        download.status = DownloadStatus.DOWNLOADING
 
-                # Update progress fields
-                download.downloaded_bytes = progress.get("downloaded", 0)
-                download.total_bytes = progress.get("size", 0)
-                if download.total_bytes > 0:
-                    download.progress = (download.downloaded_bytes / download.total_bytes) * 100.0
-                else:
-                    download.progress = progress.get("progress", 0.0) * 100.0
-
-                # Sync global films catalogue with live progress
-                effective_film_id = download.imdb_id or (f"noid-{download.torrent_hash}" if download.torrent_hash else None)
-                if effective_film_id:
-                    try:
-                        await FilmService.update_film_progress(
-                            session,
-                            imdb_id=effective_film_id,
-                            status=download.status.value,
-                            progress=download.progress,
-                            download_speed=progress.get("dlspeed", 0),
-                            total_bytes=download.total_bytes,
-                            downloaded_bytes=download.downloaded_bytes,
-                            eta=progress.get("eta"),
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to sync film progress for {effective_film_id}: {e}")
+            # Update progress fields
+            download.downloaded_bytes = progress.get("downloaded", 0)
+            download.total_bytes = progress.get("size", 0)
+            if download.total_bytes > 0:
+                download.progress = (download.downloaded_bytes / download.total_bytes) * 100.0
+            else:
+                download.progress = progress.get("progress", 0.0) * 100.0
+
+            # Sync global films catalogue with live progress
+            effective_film_id = download.imdb_id or (f"noid-{download.torrent_hash}" if download.torrent_hash else None)
+            if effective_film_id:
+                try:
+                    await FilmService.update_film_progress(
+                        session,
+                        imdb_id=effective_film_id,
+                        status=download.status.value,
+                        progress=download.progress,
+                        download_speed=progress.get("dlspeed", 0),
+                        total_bytes=download.total_bytes,
+                        downloaded_bytes=download.downloaded_bytes,
+                        eta=progress.get("eta"),
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to sync film progress for {effective_film_id}: {e}")
 
         return download
 
@@ -225,8 +220,8 @@ class DownloadService:
 
         # Only look up TMDB for real IMDb IDs
         if imdb_id.startswith("tt"):
-            from app.services.tmdb_service import TmdbService
-            tmdb = TmdbService()
+            from app.services.tmdb_service import get_tmdb_service
+            tmdb = get_tmdb_service()
             details = await tmdb.get_by_imdb(imdb_id)
 
         # Parse duration from TMDB runtime string (e.g. "120 min" to 7200 seconds)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -111,7 +112,7 @@ class FilmService:
         Considers ALL torrent hashes per film (from Film.torrent_hash and the
         Downloads table) so that multi-torrent films reflect their best status.
         """
-        from app.services.torrent_service import TorrentService
+        from app.services.torrent_service import get_torrent_service
         from app.models.download import Download
 
         result = await session.execute(
@@ -153,9 +154,9 @@ class FilmService:
             return
 
         try:
-            async with TorrentService() as ts:
-                hashes_str = "|".join(all_hashes)
-                torrents = await ts.list_torrents(hashes=hashes_str)
+            ts = get_torrent_service()
+            hashes_str = "|".join(all_hashes)
+            torrents = await ts.list_torrents(hashes=hashes_str)
 
             COMPLETED_STATES = {"uploading", "forcedUP", "stalledUP", "queuedUP", "checkingUP",
                                 "pausedUP", "stoppedUP"}
@@ -251,8 +252,8 @@ class FilmService:
         Discover torrents in qBittorrent that have no corresponding Film entry
         and register them automatically so they appear in the library.
         """
-        from app.services.torrent_service import TorrentService
-        from app.services.tmdb_service import TmdbService
+        from app.services.torrent_service import get_torrent_service
+        from app.services.tmdb_service import get_tmdb_service
         from app.models.download import Download
 
         try:
@@ -261,8 +262,8 @@ class FilmService:
             guess_it = None
 
         try:
-            async with TorrentService() as ts:
-                all_torrents = await ts.list_torrents()
+            ts = get_torrent_service()
+            all_torrents = await ts.list_torrents()
 
             if not all_torrents:
                 return
@@ -294,13 +295,44 @@ class FilmService:
             PAUSED_STATES = {"pausedDL", "stoppedDL"}
             ERROR_STATES = {"error", "missingFiles", "unknown"}
 
-            tmdb = TmdbService()
+            tmdb = get_tmdb_service()
             new_count = 0
 
+            orphans = []
+            seen_hashes: set[str] = set()
             for t in all_torrents:
                 h = t.get("hash", "").lower()
-                if not h or h in known_hashes:
-                    continue
+                if h and h not in known_hashes and h not in seen_hashes:
+                    seen_hashes.add(h)
+                    orphans.append(t)
+            if not orphans:
+                return
+
+            # Try to identify each film via guessit + TMDB lookup
+            async def identify(name: str) -> str | None:
+                if not guess_it:
+                    return None
+                try:
+                    info = guess_it(name)
+                    parsed_title = info.get("title")
+                    if parsed_title:
+                        return await tmdb.find_imdb_by_title(parsed_title, info.get("year"))
+                except Exception as e:
+                    logger.debug(f"guessit/TMDB lookup failed for '{name}': {e}")
+                return None
+
+            # TMDB lookups run concurrently; the session work below stays sequential
+            guessed_ids = await asyncio.gather(
+                *(identify(t.get("name", t["hash"].lower())) for t in orphans)
+            )
+            new_ids = list(dict.fromkeys(
+                i for i in guessed_ids
+                if i and i.startswith("tt") and i not in known_imdb_ids
+            ))
+            details_by_id = dict(zip(new_ids, await tmdb.get_many_by_imdb(new_ids)))
+
+            for t, imdb_id in zip(orphans, guessed_ids):
+                h = t["hash"].lower()
 
                 state = t.get("state", "")
                 if state in COMPLETED_STATES:
@@ -317,21 +349,9 @@ class FilmService:
                 progress = (downloaded / total * 100) if total > 0 else (t.get("progress", 0) * 100)
 
                 name = t.get("name", h)
-
-                # Try to identify the film via guessit + TMDB lookup
-                imdb_id = None
                 details = None
-                if guess_it:
-                    try:
-                        info = guess_it(name)
-                        parsed_title = info.get("title")
-                        parsed_year = info.get("year")
-                        if parsed_title:
-                            imdb_id = await tmdb.find_imdb_by_title(parsed_title, parsed_year)
-                    except Exception as e:
-                        logger.debug(f"guessit/TMDB lookup failed for '{name}': {e}")
-
-                # Fetch full metadata if we got an IMDb ID
+
+                # Use the full metadata if we got an IMDb ID
                 if imdb_id and imdb_id.startswith("tt"):
                     # Skip if a Film with this imdb_id already exists (avoid duplicates)
                     if imdb_id in known_imdb_ids:
@@ -342,10 +362,7 @@ class FilmService:
                         known_hashes.add(h)
                         continue
 
-                    try:
-                        details = await tmdb.get_by_imdb(imdb_id)
-                    except Exception:
-                        pass
+                    details = details_by_id.get(imdb_id)
 
                 # Build the film entry
                 if details and imdb_id:
@@ -652,8 +669,8 @@ class FilmService:
         await session.flush()
         await session.refresh(comment)
         # Fetch username
-        user_result = await session.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
+        # Usually the request's authenticated user: served from the identity map
+        user = await session.get(User, user_id)
         return {
             "id": str(comment.id),
             "user_id": str(comment.user_id),
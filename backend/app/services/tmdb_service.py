@@ -1,7 +1,12 @@
 import asyncio
 import time
+from collections import deque
 import httpx
+import hishel
+import orjson
 import logging
+import redis.asyncio as aioredis
+from cachetools import TTLCache
 from typing import Optional
 from app.config import settings
 
@@ -10,75 +15,244 @@ logger = logging.getLogger(__name__)
 TMDB_BASE = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 
+# Endpoint URLs (per-id endpoints are suffixed at call time)
+SEARCH_MULTI_URL = f"{TMDB_BASE}/search/multi"
+SEARCH_MOVIE_URL = f"{TMDB_BASE}/search/movie"
+SEARCH_TV_URL = f"{TMDB_BASE}/search/tv"
+DISCOVER_URL = f"{TMDB_BASE}/discover/movie"
+FIND_URL = f"{TMDB_BASE}/find/"
+
+# Immutable base query params, copied into a dict only when extended
+SEARCH_BASE_PARAMS = (("include_adult", "false"),)
+DISCOVER_BASE_PARAMS = (("include_adult", "false"),)
+FIND_PARAMS = (("external_source", "imdb_id"),)
+DETAIL_PARAMS = (("append_to_response", "credits"),)
+
 # Rate limit: TMDB allows 40 req/s
 _RATE_LIMIT = 35
 _RATE_WINDOW = 1.0 # seconds
 
+# Adaptive concurrency (AIMD): halve on 429/5xx, +1 after a run of successes
+_MIN_CONCURRENCY = 1
+_MAX_CONCURRENCY = _RATE_LIMIT
+_INCREASE_AFTER = 10 # consecutive successes
+_DEFAULT_RETRY_AFTER = 1.0 # seconds
+
+# Retries inside _get: 429 waits for Retry-After, 5xx backs off exponentially
+_MAX_ATTEMPTS_429 = 2
+_MAX_ATTEMPTS_5XX = 3
+_BACKOFF_BASE = 0.25 # seconds
+
+# Shared (cross-worker) cache of normalized details
+_REDIS_PREFIX = "tmdb:"
+_REDIS_TTL = 86400 # seconds
+
+# HTTP-level cache honouring TMDB's Cache-Control / ETag headers
+_HTTP_CACHE_CAPACITY = 5000 # responses
+
+# Media types kept from /search/multi
+_ALLOWED_MEDIA = frozenset(("movie", "tv"))
+
+# Crew jobs kept in the detailed crew list
+_CREW_JOBS = frozenset(("Director", "Producer", "Screenplay", "Writer"))
+
+# Misses are remembered briefly so new TMDB entries show up eventually
+_NEG_CACHE_SIZE = 10000
+_NEG_CACHE_TTL = 300 # seconds
+
 
 class _RateLimiter:
-    """Simple sliding-window rate limiter for async code."""
+    """
+    Simple sliding-window rate limiter for async code.
+
+    Everything between the check and the append runs without awaiting, so on a
+    single event loop no lock is needed and the common under-budget case
+    returns without yielding to the scheduler.
+    """
 
     def __init__(self, max_calls: int, window: float):
         self._max_calls = max_calls
         self._window = window
-        self._timestamps: list[float] = []
-        self._lock = asyncio.Lock()
+        self._timestamps: deque[float] = deque()
 
     async def acquire(self):
+        timestamps = self._timestamps
         while True:
-            async with self._lock:
-                now = time.monotonic()
-                # Purge timestamps outside the window
-                self._timestamps = [t for t in self._timestamps if now - t < self._window]
-                if len(self._timestamps) < self._max_calls:
-                    self._timestamps.append(now)
-                    return
-                # Calculate how long to wait
-                wait = self._window - (now - self._timestamps[0])
+            now = time.monotonic()
+            # Purge timestamps outside the window
+            while timestamps and now - timestamps[0] >= self._window:
+                timestamps.popleft()
+            if len(timestamps) < self._max_calls:
+                timestamps.append(now)
+                return
+            # Calculate how long to wait
+            wait = self._window - (now - timestamps[0])
             await asyncio.sleep(max(wait, 0.01))
 
 
+class _AdaptiveLimiter:
+    """
+    AIMD concurrency limiter: the number of in-flight requests is halved when
+    TMDB reports overload (429 / 5xx) and grows back by one permit after every
+    `increase_after` consecutive successes.
+    """
+
+    def __init__(self, min_permits: int, max_permits: int, increase_after: int):
+        self._min = min_permits
+        self._max = max_permits
+        self._increase_after = increase_after
+        self._permits = max_permits
+        self._in_use = 0
+        self._successes = 0
+        self._resume_at = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_use < self._permits)
+            self._in_use += 1
+        # Honour any Retry-After backoff announced by a previous response
+        wait = self._resume_at - time.monotonic()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                # Cancelled while backing off: the caller never gets to release()
+                async with self._cond:
+                    self._in_use -= 1
+                    self._cond.notify_all()
+                raise
+
+    async def release(self, overloaded: bool | None, retry_after: float = 0.0):
+        """
+        Give back a permit. `overloaded` is True for 429/5xx, False for a
+        healthy response and None when the request failed for another reason.
+        """
+        async with self._cond:
+            self._in_use -= 1
+            if overloaded:
+                self._permits = max(self._min, self._permits // 2)
+                self._successes = 0
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+                logger.warning(f"TMDB overloaded, concurrency reduced to {self._permits}")
+            elif overloaded is False:
+                self._successes += 1
+                if self._successes >= self._increase_after:
+                    self._successes = 0
+                    self._permits = min(self._max, self._permits + 1)
+            self._cond.notify_all()
+
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Return the Retry-After delay in seconds (only the delta-seconds form is used by TMDB)."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER
+
+
 class TmdbService:
     """
     Fetches movie/series details from the TMDB API using an IMDb ID.
-    Includes an in-memory cache and a rate limiter (40 req/s TMDB limit).
+    Includes an in-memory cache (L1), an optional Redis cache shared between
+    workers (L2) and a rate limiter (40 req/s TMDB limit).
     """
 
     def __init__(self):
         self._cache: dict[str, Optional[dict]] = {}
+        self._neg_cache: TTLCache = TTLCache(maxsize=_NEG_CACHE_SIZE, ttl=_NEG_CACHE_TTL)
         self._rate_limiter = _RateLimiter(_RATE_LIMIT, _RATE_WINDOW)
+        self._concurrency = _AdaptiveLimiter(_MIN_CONCURRENCY, _MAX_CONCURRENCY, _INCREASE_AFTER)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._redis: Optional[aioredis.Redis] = (
+            aioredis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+        )
 
-    @property
-    def _api_key(self) -> str:
-        return settings.TMDB_API_KEY
+        # Auth is constant for the process lifetime: a v4 Bearer token (JWT)
+        # goes in the Authorization header, a v3 API key in the query string.
+        self._api_key = settings.TMDB_API_KEY
+        self._is_bearer = self._api_key.startswith("eyJ") if self._api_key else False
+        if self._is_bearer:
+            self._auth_headers = {"Authorization": f"Bearer {self._api_key}", "accept": "application/json"}
+            self._auth_params = {}
+        else:
+            self._auth_headers = {"accept": "application/json"}
+            self._auth_params = {"api_key": self._api_key}
 
     @property
-    def _is_bearer_token(self) -> bool:
-        """Detect whether the key is a v4 Bearer token (JWT) or a v3 API key."""
-        return self._api_key.startswith("eyJ")
-
-    def _auth_headers(self) -> dict:
-        if self._is_bearer_token:
-            return {"Authorization": f"Bearer {self._api_key}", "accept": "application/json"}
-        return {"accept": "application/json"}
-
-    def _auth_params(self) -> dict:
-        if self._is_bearer_token:
-            return {}
-        return {"api_key": self._api_key}
+    def _http(self) -> httpx.AsyncClient:
+        """
+        Persistent HTTP/2 client carrying the auth headers/params, created on
+        first use. Responses go through an RFC 7234 cache, so fresh entries
+        skip the network and stale ones are revalidated with If-None-Match.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = hishel.AsyncCacheClient(
+                storage=hishel.AsyncInMemoryStorage(capacity=_HTTP_CACHE_CAPACITY),
+                http2=True,
+                timeout=10,
+                headers=self._auth_headers,
+                params=self._auth_params,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the persistent HTTP client and the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._redis is not None:
+            await self._redis.aclose()
 
     def _poster_url(self, path: Optional[str]) -> Optional[str]:
         if not path:
             return None
         return f"{TMDB_IMAGE_BASE}{path}"
 
-    async def _get(self, client: httpx.AsyncClient, url: str, params: dict | None = None) -> httpx.Response:
-        """Rate-limited GET request."""
-        await self._rate_limiter.acquire()
-        merged = {**self._auth_params(), **(params or {})}
-        resp = await client.get(url, headers=self._auth_headers(), params=merged)
-        resp.raise_for_status()
-        return resp
+    async def _get(self, url: str, params=None):
+        """
+        Rate-limited GET with adaptive concurrency, returning the decoded JSON.
+        The body is streamed into a single buffer and parsed once.
+        429 is retried after Retry-After and 5xx with exponential backoff;
+        any other 4xx (or an exhausted retry budget) raises HTTPStatusError.
+        """
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire()
+            await self._concurrency.acquire()
+            overloaded: bool | None = None
+            delay = 0.0
+            body = None
+            try:
+                async with self._http.stream("GET", url, params=params) as resp:
+                    status = resp.status_code
+                    overloaded = status == 429 or status >= 500
+                    if overloaded:
+                        attempt += 1
+                        if status == 429:
+                            delay = _parse_retry_after(resp.headers.get("Retry-After"))
+                            max_attempts = _MAX_ATTEMPTS_429
+                        else:
+                            max_attempts = _MAX_ATTEMPTS_5XX
+                            # Our own backoff only delays the retry below; with no retry
+                            # left it must not hold up other requests via the limiter
+                            if attempt < max_attempts:
+                                delay = 2 ** (attempt - 1) * _BACKOFF_BASE
+                        if attempt >= max_attempts:
+                            resp.raise_for_status()
+                    else:
+                        resp.raise_for_status()
+                        body = bytearray()
+                        async for chunk in resp.aiter_bytes():
+                            body.extend(chunk)
+            finally:
+                await self._concurrency.release(overloaded, delay)
+
+            if body is not None:
+                return orjson.loads(body)
+            logger.warning(f"TMDB returned {status} for {url}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
 
     async def get_available_subtitles(self, tmdb_id: int, media_type: str = "movie") -> list[str]:
         """
@@ -89,41 +263,36 @@ class TmdbService:
         if cache_key in self._cache:
             return self._cache[cache_key]  # type: ignore[return-value]
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await self._get(
-                    client,
-                    f"{TMDB_BASE}/{media_type}/{tmdb_id}/translations",
-                )
-                data = resp.json()
-                languages = [
-                    t.get("english_name") or t.get("name") or t.get("iso_639_1", "")
-                    for t in data.get("translations", [])
-                    if t.get("iso_639_1")
-                ]
-                self._cache[cache_key] = languages
-                return languages
+            data = await self._get(
+                f"{TMDB_BASE}/{media_type}/{tmdb_id}/translations",
+            )
+            languages = [
+                t.get("english_name") or t.get("name") or t.get("iso_639_1", "")
+                for t in data.get("translations", [])
+                if t.get("iso_639_1")
+            ]
+            self._cache[cache_key] = languages
+            return languages
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             logger.error(f"TMDB get_available_subtitles error for tmdb_id={tmdb_id}: {e}")
             return []
 
     def _normalize_brief(self, item: dict, media_type: str) -> dict:
         """Lightweight normalize for search/discover results (no full detail fetch)."""
-        title = item.get("title") or item.get("name") or ""
-        release_date = item.get("release_date") or item.get("first_air_date") or ""
-        year = release_date[:4] if release_date else None
-        vote_avg = item.get("vote_average")
-        imdb_rating = str(round(vote_avg, 1)) if vote_avg else None
+        get = item.get
+        release_date = get("release_date") or get("first_air_date") or ""
+        vote_avg = get("vote_average")
         return {
-            "tmdb_id":    item.get("id"),
+            "tmdb_id":    get("id"),
             "imdbid":     None,
-            "title":      title,
-            "year":       year,
-            "poster":     self._poster_url(item.get("poster_path")),
-            "imdb_rating": imdb_rating,
-            "plot":       item.get("overview") or "",
+            "title":      get("title") or get("name") or "",
+            "year":       release_date[:4] if release_date else None,
+            "poster":     self._poster_url(get("poster_path")),
+            "imdb_rating": str(round(vote_avg, 1)) if vote_avg else None,
+            "plot":       get("overview") or "",
             "type":       media_type,
             "genre_tags": [],
-            "popularity": item.get("popularity", 0),
+            "popularity": get("popularity", 0),
         }
 
     async def search_by_title(self, query: str, page: int = 1) -> list[dict]:
@@ -131,13 +300,10 @@ class TmdbService:
         if not query or not self._api_key:
             return []
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await self._get(
-                    client,
-                    f"{TMDB_BASE}/search/multi",
-                    {"query": query, "page": page, "include_adult": "false"},
-                )
-                data = resp.json()
+            params = dict(SEARCH_BASE_PARAMS)
+            params["query"] = query
+            params["page"] = page
+            data = await self._get(SEARCH_MULTI_URL, params)
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             logger.error(f"TMDB search_by_title error for '{query}': {e}")
             return []
@@ -145,7 +311,7 @@ class TmdbService:
         results = []
         for item in data.get("results", []):
             media_type = item.get("media_type", "movie")
-            if media_type not in ("movie", "tv"):
+            if media_type not in _ALLOWED_MEDIA:
                 continue
             brief = self._normalize_brief(item, media_type)
             if not brief["poster"]:
@@ -165,52 +331,55 @@ class TmdbService:
         cache_key = f"_title_lookup:{title}:{year}"
         if cache_key in self._cache:
             return self._cache[cache_key]
+        neg_key = ("title", title, year)
+        if neg_key in self._neg_cache:
+            return None
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Try movie first
-                params: dict = {"query": title, "include_adult": "false"}
+            # Try movie first
+            params = dict(SEARCH_BASE_PARAMS)
+            params["query"] = title
+            if year:
+                params["year"] = str(year)
+
+            data = await self._get(SEARCH_MOVIE_URL, params)
+            results = data.get("results", [])
+
+            tmdb_id = None
+            media_type = "movie"
+
+            if results:
+                tmdb_id = results[0]["id"]
+            else:
+                # Fallback: search TV
+                tv_params = dict(SEARCH_BASE_PARAMS)
+                tv_params["query"] = title
                 if year:
-                    params["year"] = str(year)
-
-                resp = await self._get(client, f"{TMDB_BASE}/search/movie", params)
-                data = resp.json()
-                results = data.get("results", [])
-
-                tmdb_id = None
-                media_type = "movie"
+                    tv_params["first_air_date_year"] = str(year)
+                data = await self._get(SEARCH_TV_URL, tv_params)
+                tv_results = data.get("results", [])
+                if tv_results:
+                    tmdb_id = tv_results[0]["id"]
+                    media_type = "tv"
 
-                if results:
-                    tmdb_id = results[0]["id"]
-                else:
-                    # Fallback: search TV
-                    tv_params: dict = {"query": title, "include_adult": "false"}
-                    if year:
-                        tv_params["first_air_date_year"] = str(year)
-                    resp = await self._get(client, f"{TMDB_BASE}/search/tv", tv_params)
-                    data = resp.json()
-                    tv_results = data.get("results", [])
-                    if tv_results:
-                        tmdb_id = tv_results[0]["id"]
-                        media_type = "tv"
-
-                if not tmdb_id:
-                    self._cache[cache_key] = None
-                    return None
-
-                # Fetch external IDs to get the IMDb ID
-                resp = await self._get(
-                    client,
-                    f"{TMDB_BASE}/{media_type}/{tmdb_id}/external_ids",
-                )
-                ext = resp.json()
-                imdb_id = ext.get("imdb_id") or None
-                self._cache[cache_key] = imdb_id
-                return imdb_id
+            if not tmdb_id:
+                self._neg_cache[neg_key] = True
+                return None
+
+            # Fetch external IDs to get the IMDb ID
+            ext = await self._get(
+                f"{TMDB_BASE}/{media_type}/{tmdb_id}/external_ids",
+            )
+            imdb_id = ext.get("imdb_id") or None
+            if imdb_id is None:
+                self._neg_cache[neg_key] = True
+                return None
+            self._cache[cache_key] = imdb_id
+            return imdb_id
 
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             logger.error(f"TMDB find_imdb_by_title error for '{title}' ({year}): {e}")
-            self._cache[cache_key] = None
+            self._neg_cache[neg_key] = True
             return None
 
     async def discover(
@@ -234,12 +403,10 @@ class TmdbService:
         else:
             vote_floor = "30"
 
-        params: dict = {
-            "sort_by":         sort_by,
-            "page":            page,
-            "include_adult":   "false",
-            "vote_count.gte":  vote_floor,
-        }
+        params = dict(DISCOVER_BASE_PARAMS)
+        params["sort_by"] = sort_by
+        params["page"] = page
+        params["vote_count.gte"] = vote_floor
         if genre_id:
             params["with_genres"] = str(genre_id)
         if date_gte:
@@ -251,9 +418,7 @@ class TmdbService:
         if min_rating and min_rating > 0:
             params["vote_average.gte"] = str(min_rating)
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await self._get(client, f"{TMDB_BASE}/discover/movie", params)
-                data = resp.json()
+            data = await self._get(DISCOVER_URL, params)
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             logger.error(f"TMDB discover error: {e}")
             return {"results": [], "total_pages": 0}
@@ -281,45 +446,77 @@ class TmdbService:
             logger.error("TMDB_API_KEY is not configured — cannot fetch details")
             return None
 
-        # Check cache
+        # Check in-memory cache (L1)
         if imdb_id in self._cache:
             logger.debug(f"TMDB cache hit: {imdb_id}")
             return self._cache[imdb_id]
+        if imdb_id in self._neg_cache:
+            logger.debug(f"TMDB negative cache hit: {imdb_id}")
+            return None
 
+        # Check shared cache (L2)
+        cached = await self._redis_get(imdb_id)
+        if cached is not None:
+            logger.debug(f"TMDB redis hit: {imdb_id}")
+            self._cache[imdb_id] = cached
+            return cached
+
+        # Coalesce concurrent lookups of the same id into a single fetch
+        task = self._inflight.get(imdb_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_by_imdb(imdb_id))
+            self._inflight[imdb_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(imdb_id, None))
+        return await asyncio.shield(task)
+
+    async def get_many_by_imdb(self, imdb_ids: list[str]) -> list[Optional[dict]]:
+        """
+        Batch variant of get_by_imdb: resolves all ids concurrently and returns
+        results in the same order as `imdb_ids` (None where a lookup failed).
+        Concurrency is bounded by the shared limiter in _get.
+        """
+        results = await asyncio.gather(
+            *(self.get_by_imdb(i) for i in imdb_ids), return_exceptions=True
+        )
+        details: list[Optional[dict]] = []
+        for imdb_id, result in zip(imdb_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"TMDB lookup failed for {imdb_id}: {result}")
+                result = None
+            details.append(result)
+        return details
+
+    async def _fetch_by_imdb(self, imdb_id: str) -> Optional[dict]:
+        """Hit TMDB /find + details for one IMDb ID and fill both cache levels."""
         logger.info(f"TMDB find request: {imdb_id}")
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                # find the TMDB id from the IMDb id
-                find_resp = await self._get(
-                    client,
-                    f"{TMDB_BASE}/find/{imdb_id}",
-                    {"external_source": "imdb_id"},
-                )
-                find_data = find_resp.json()
-
-                # TMDB returns matches in typed arrays
-                movie_results = find_data.get("movie_results", [])
-                tv_results = find_data.get("tv_results", [])
-
-                if movie_results:
-                    tmdb_id = movie_results[0]["id"]
-                    media_type = "movie"
-                elif tv_results:
-                    tmdb_id = tv_results[0]["id"]
-                    media_type = "tv"
-                else:
-                    logger.warning(f"TMDB found no results for {imdb_id}")
-                    self._cache[imdb_id] = None
-                    return None
-
-                # fetch full details + credits (single request)
-                detail_resp = await self._get(
-                    client,
-                    f"{TMDB_BASE}/{media_type}/{tmdb_id}",
-                    {"append_to_response": "credits"},
-                )
-                data = detail_resp.json()
+            # find the TMDB id from the IMDb id
+            find_data = await self._get(
+                f"{FIND_URL}{imdb_id}",
+                FIND_PARAMS,
+            )
+
+            # TMDB returns matches in typed arrays
+            movie_results = find_data.get("movie_results", [])
+            tv_results = find_data.get("tv_results", [])
+
+            if movie_results:
+                tmdb_id = movie_results[0]["id"]
+                media_type = "movie"
+            elif tv_results:
+                tmdb_id = tv_results[0]["id"]
+                media_type = "tv"
+            else:
+                logger.warning(f"TMDB found no results for {imdb_id}")
+                self._neg_cache[imdb_id] = True
+                return None
+
+            # fetch full details + credits (single request)
+            data = await self._get(
+                f"{TMDB_BASE}/{media_type}/{tmdb_id}",
+                DETAIL_PARAMS,
+            )
 
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             logger.error(f"TMDB request error for {imdb_id}: {e}")
@@ -327,17 +524,44 @@ class TmdbService:
 
         result = self._normalize(imdb_id, tmdb_id, media_type, data)
         self._cache[imdb_id] = result
+        await self._redis_set(imdb_id, result)
         return result
 
-    def _normalize(self, imdb_id: str, tmdb_id: int, media_type: str, data: dict) -> dict:
+    async def _redis_get(self, imdb_id: str) -> Optional[dict]:
+        """Read normalized details from Redis. Any Redis failure counts as a miss."""
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(f"{_REDIS_PREFIX}{imdb_id}")
+        except aioredis.RedisError as e:
+            logger.warning(f"TMDB redis get failed for {imdb_id}: {e}")
+            return None
+        return orjson.loads(raw) if raw else None
+
+    async def _redis_set(self, imdb_id: str, result: dict):
+        """Store normalized details in Redis with a TTL. Failures are logged only."""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(f"{_REDIS_PREFIX}{imdb_id}", _REDIS_TTL, orjson.dumps(result))
+        except aioredis.RedisError as e:
+            logger.warning(f"TMDB redis set failed for {imdb_id}: {e}")
+
+    def _normalize(
+        self,
+        imdb_id: str,
+        tmdb_id: int,
+        media_type: str,
+        data: dict,
+    ) -> dict:
         """Normalize TMDB details response into our format."""
         title = data.get("title") or data.get("name") or ""
         release_date = data.get("release_date") or data.get("first_air_date") or ""
         year = release_date[:4] if release_date else None
 
         # Genres
-        genres = data.get("genres", [])
-        genre_str = ", ".join(g["name"] for g in genres)
+        genres = data.get("genres")
+        genre_str = ", ".join(g["name"] for g in genres) if genres else ""
 
         # Runtime
         runtime_min = data.get("runtime") or (
@@ -350,29 +574,35 @@ class TmdbService:
         cast_list = credits.get("cast", [])
         crew_list = credits.get("crew", [])
 
-        directors = [c["name"] for c in crew_list if c.get("job") == "Director"]
-        writers = [c["name"] for c in crew_list if c.get("department") == "Writing"]
-        producers = [c["name"] for c in crew_list if c.get("job") == "Producer"]
-        actors = [c["name"] for c in cast_list[:6]]
+        poster_url = self._poster_url
+        cast_slice = cast_list[:12]
+
+        # Single pass over crew: directors / writers / producers + detailed crew
+        directors, writers, producers, crew_detailed = [], [], [], []
+        for c in crew_list:
+            job = c.get("job")
+            if job == "Director":
+                directors.append(c["name"])
+            elif job == "Producer":
+                producers.append(c["name"])
+            if c.get("department") == "Writing":
+                writers.append(c["name"])
+            if job in _CREW_JOBS:
+                crew_detailed.append({
+                    "name": c.get("name"),
+                    "job": job,
+                    "profile_path": poster_url(c.get("profile_path")),
+                })
+        actors = [c["name"] for c in cast_slice[:6]]
 
         # Structured cast with photos (for the detail page)
         cast_detailed = [
             {
                 "name": c.get("name"),
                 "character": c.get("character"),
-                "profile_path": self._poster_url(c.get("profile_path")),
-            }
-            for c in cast_list[:12]
-        ]
-
-        crew_detailed = [
-            {
-                "name": c.get("name"),
-                "job": c.get("job"),
-                "profile_path": self._poster_url(c.get("profile_path")),
+                "profile_path": poster_url(c.get("profile_path")),
             }
-            for c in crew_list
-            if c.get("job") in ("Director", "Producer", "Screenplay", "Writer")
+            for c in cast_slice
         ]
 
         # Ratings
@@ -380,8 +610,10 @@ class TmdbService:
         imdb_rating = str(round(vote_avg, 1)) if vote_avg else None
 
         # Languages / countries
-        spoken = data.get("spoken_languages", [])
-        language = ", ".join(l.get("english_name") or l.get("name", "") for l in spoken) or None
+        languages = []
+        for l in data.get("spoken_languages") or ():
+            languages.append(l.get("english_name") or l.get("name", ""))
+        language = ", ".join(languages) or None
         prod_countries = data.get("production_countries", [])
         country = ", ".join(c.get("name", "") for c in prod_countries) or None
 
@@ -411,7 +643,7 @@ class TmdbService:
             "language": language,
             "country": country,
             "awards": None,
-            "poster": self._poster_url(data.get("poster_path")),
+            "poster": poster_url(data.get("poster_path")),
             "backdrop": backdrop_url,
             "ratings": [],
             "metascore": None,
@@ -421,3 +653,24 @@ class TmdbService:
             "total_seasons": data.get("number_of_seasons"),
             "box_office": str(data.get("revenue")) if data.get("revenue") else None,
         }
+
+
+# Process-wide instance so the rate limiter and caches are shared by every
+# request instead of being rebuilt per call site.
+_service: Optional[TmdbService] = None
+
+
+def get_tmdb_service() -> TmdbService:
+    """Return the shared TmdbService (usable as a FastAPI dependency)."""
+    global _service
+    if _service is None:
+        _service = TmdbService()
+    return _service
+
+
+async def close_tmdb_service():
+    """Release the shared service's connections (called on app shutdown)."""
+    global _service
+    if _service is not None:
+        await _service.aclose()
+        _service = None
@@ -1,10 +1,160 @@
+import asyncio
+import base64
+import hashlib
+import re
+import time
 import httpx
 import logging
+import orjson
 from typing import Optional
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# /torrents/info answers are reused for this long (UI polls every second)
+_INFO_CACHE_TTL = 0.5 # seconds
+
+# .torrent downloads: redirect hops followed by httpx, and a hard size cap
+_MAX_REDIRECTS = 10
+_MAX_TORRENT_BYTES = 10 * 1024 * 1024
+_DOWNLOAD_CHUNK = 65536
+
+# JSON bodies larger than this are parsed in a worker thread, off the event loop
+_THREAD_PARSE_BYTES = 256 * 1024
+
+# BitTorrent v1 info-hash in a magnet URI: 40 hex chars or 32 base32 chars
+_BTIH_RE = re.compile(r"xt=urn:btih:([0-9A-Fa-f]{40}|[A-Za-z2-7]{32})(?![0-9A-Za-z])")
+
+# The /torrents/info fields the app reads; the ~40 others are dropped once at fetch time
+_TORRENT_FIELDS = (
+    "hash", "name", "progress", "state", "dlspeed",
+    "eta", "size", "downloaded", "save_path",
+)
+
+# get_progress calls arriving within this window share one /torrents/info request
+_BATCH_WINDOW = 0.02 # seconds
+
+
+def extract_infohash(magnet: str) -> Optional[str]:
+    """
+    Return the info-hash of a magnet link as lowercase hex (the form
+    qBittorrent reports), converting base32 hashes. None if there is none.
+    """
+    m = _BTIH_RE.search(magnet)
+    if m is None:
+        return None
+    value = m.group(1)
+    if len(value) == 32:
+        return base64.b32decode(value.upper()).hex()
+    return value.lower()
+
+
+def _bencode_skip(data: bytes, pos: int) -> int:
+    """
+    Return the offset just past the bencoded value that starts at `pos`.
+    Iterative, tracking open lists/dicts as a depth counter, so deeply nested
+    input can't exhaust the Python stack.
+    """
+    depth = 0
+    while True:
+        c = data[pos]
+        if c == 0x69:  # i<digits>e
+            pos = data.index(b"e", pos) + 1
+        elif c == 0x6C or c == 0x64:  # l...e / d...e (dict keys are plain strings)
+            depth += 1
+            pos += 1
+        elif c == 0x65 and depth:  # end of the innermost open list/dict
+            depth -= 1
+            pos += 1
+        elif 0x30 <= c <= 0x39:  # <len>:<bytes>
+            colon = data.index(b":", pos)
+            end = colon + 1 + int(data[pos:colon])
+            if end > len(data):
+                raise ValueError("truncated bencode string")
+            pos = end
+        else:
+            raise ValueError(f"invalid bencode token at offset {pos}")
+        if depth == 0:
+            return pos
+
+
+def _info_span(data: bytes) -> tuple[int, int]:
+    """
+    Locate the raw bytes of the top-level `info` dict in a .torrent file.
+    The info-hash is the SHA-1 of exactly that slice, so there is no need to
+    decode the whole file and re-encode `info`.
+    """
+    if data[:1] != b"d":
+        raise ValueError("torrent is not a bencoded dict")
+    pos = 1
+    while data[pos] != 0x65:
+        key_end = _bencode_skip(data, pos)
+        key = data[data.index(b":", pos) + 1:key_end]
+        value_end = _bencode_skip(data, key_end)
+        if key == b"info":
+            return key_end, value_end
+        pos = value_end
+    raise KeyError("info")
+
+
+class _MagnetRedirect(Exception):
+    """Raised by the response hook when a redirect points at a magnet: URI."""
+
+    def __init__(self, location: str):
+        super().__init__(location)
+        self.location = location
+
+
+async def _magnet_redirect_hook(response: httpx.Response):
+    """
+    Response event hook: httpx can't follow a redirect to magnet:, so unwind
+    out of its redirect loop with the target instead.
+    """
+    if response.is_redirect:
+        location = response.headers.get("location", "")
+        if location.startswith("magnet:"):
+            raise _MagnetRedirect(location)
+
+
+class _ProgressBatcher:
+    """
+    Coalesces per-hash lookups: hashes requested within _BATCH_WINDOW are
+    fetched with a single `hashes=a|b|c` listing and each caller gets its
+    own torrent dict back (or None if qBittorrent doesn't know the hash).
+    """
+
+    def __init__(self, service: "TorrentService"):
+        self._service = service
+        self._pending: dict[str, asyncio.Future] = {}
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    async def get(self, torrent_hash: str) -> Optional[dict]:
+        fut = self._pending.get(torrent_hash)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._pending[torrent_hash] = fut
+            if self._handle is None:
+                self._handle = loop.call_later(_BATCH_WINDOW, self._flush)
+        return await asyncio.shield(fut)
+
+    def _flush(self):
+        batch, self._pending, self._handle = self._pending, {}, None
+        asyncio.ensure_future(self._resolve(batch))
+
+    async def _resolve(self, batch: dict[str, asyncio.Future]):
+        try:
+            torrents = await self._service.list_torrents(hashes="|".join(batch))
+        except Exception as e:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        by_hash = {t["hash"].lower(): t for t in torrents}
+        for torrent_hash, fut in batch.items():
+            if not fut.done():
+                fut.set_result(by_hash.get(torrent_hash))
+
 
 class TorrentService:
     """
@@ -12,54 +162,122 @@ class TorrentService:
 
     Docs: https://github.com/qbittorrent/qBittorrent/wiki/WebUI-API-(qBittorrent-5.0)
 
+    A single instance is shared by the whole app (see get_torrent_service):
+    it keeps one long-lived HTTP client, logs in once and re-authenticates
+    only when qBittorrent answers 401/403.
+
     Usage:
-        async with TorrentService() as ts:
-            await ts.add_magnet("magnet:?xt=...")
-            torrents = await ts.list_torrents()
+        ts = get_torrent_service()
+        await ts.add_magnet("magnet:?xt=...")
+        torrents = await ts.list_torrents()
     """
 
-    def __init__(self):
-        self._base = settings.QBITTORRENT_URL.rstrip("/")
-        self._client: Optional[httpx.AsyncClient] = None
+    # Web API endpoints, relative to the client's base_url
+    _PATH_LOGIN = "/api/v2/auth/login"
+    _PATH_VERSION = "/api/v2/app/version"
+    _PATH_ADD = "/api/v2/torrents/add"
+    _PATH_INFO = "/api/v2/torrents/info"
+    _PATH_PROPERTIES = "/api/v2/torrents/properties"
+    _PATH_FILES = "/api/v2/torrents/files"
+    _PATH_STOP = "/api/v2/torrents/stop"
+    _PATH_START = "/api/v2/torrents/start"
+    _PATH_DELETE = "/api/v2/torrents/delete"
+    _PATH_RECHECK = "/api/v2/torrents/recheck"
+    _PATH_REANNOUNCE = "/api/v2/torrents/reannounce"
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # API paths are resolved against base_url; absolute URLs (.torrent downloads) pass through
+        self._client = client or httpx.AsyncClient(
+            base_url=settings.QBITTORRENT_URL.rstrip("/"),
+            timeout=30,
+            max_redirects=_MAX_REDIRECTS,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=40,
+                keepalive_expiry=60,
+            ),
+        )
+        self._client.event_hooks["response"].append(_magnet_redirect_hook)
         self._authenticated = False
+        # Whether we already checked for qBittorrent's auth bypass (whitelist / localhost)
+        self._bypass_probed = False
+        self._login_lock = asyncio.Lock()
+        # /torrents/info cache: params key -> (fetched_at, torrents), plus in-flight fetches
+        self._info_cache: dict[tuple, tuple[float, list]] = {}
+        self._info_inflight: dict[tuple, asyncio.Future] = {}
+        self._progress_batcher = _ProgressBatcher(self)
+
+    # lifecycle
+
+    async def startup(self):
+        """Log in eagerly. A failure is not fatal: the next request retries."""
+        try:
+            await self._login()
+        except (ConnectionError, httpx.HTTPError) as e:
+            logger.warning(f"qBittorrent not reachable at startup: {e}")
 
-    # context manager
-
-    async def __aenter__(self):
-        self._client = httpx.AsyncClient(timeout=30)
-        await self._login()
-        return self
-
-    async def __aexit__(self, *exc):
-        if self._client:
-            await self._client.aclose()
+    async def aclose(self):
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
 
     # authentication
 
     async def _login(self):
         """Authenticate with qBittorrent and store the session cookie."""
-        resp = await self._client.post(
-            f"{self._base}/api/v2/auth/login",
-            data={
-                "username": settings.QBITTORRENT_USER,
-                "password": settings.QBITTORRENT_PASS,
-            },
-        )
-        if resp.status_code != 200 or resp.text.strip() != "Ok.":
-            logger.error(f"qBittorrent login failed: {resp.status_code} {resp.text}")
-            raise ConnectionError("Cannot authenticate with qBittorrent")
-        self._authenticated = True
-        logger.info("Authenticated with qBittorrent")
+        async with self._login_lock:
+            # Another coroutine may have logged in while we waited
+            if self._authenticated:
+                return
+            if not self._bypass_probed:
+                # An unauthenticated call that succeeds means no login is needed at all
+                probe = await self._client.get(self._PATH_VERSION)
+                # Only mark the probe done once it got an answer, so a transport
+                # error (qBittorrent still starting) retries it on the next login
+                self._bypass_probed = True
+                if probe.status_code == 200:
+                    self._authenticated = True
+                    logger.info("qBittorrent auth bypass active, skipping login")
+                    return
+            resp = await self._client.post(
+                self._PATH_LOGIN,
+                data={
+                    "username": settings.QBITTORRENT_USER,
+                    "password": settings.QBITTORRENT_PASS,
+                },
+            )
+            if resp.status_code != 200 or resp.text.strip() != "Ok.":
+                logger.error(f"qBittorrent login failed: {resp.status_code} {resp.text}")
+                raise ConnectionError("Cannot authenticate with qBittorrent")
+            self._authenticated = True
+            logger.info("Authenticated with qBittorrent")
 
     # helpers
 
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send an API request, logging in first if needed and once more on 401/403."""
+        if not self._authenticated:
+            await self._login()
+        resp = await self._client.request(method, path, **kwargs)
+        if resp.status_code in (401, 403):
+            logger.info("qBittorrent session expired, logging in again")
+            self._authenticated = False
+            await self._login()
+            resp = await self._client.request(method, path, **kwargs)
+        return resp
+
     async def _get(self, path: str, params: dict = None):
-        resp = await self._client.get(f"{self._base}{path}", params=params)
+        resp = await self._request("GET", path, params=params)
         resp.raise_for_status()
-        return resp.json()
+        body = resp.content
+        if len(body) > _THREAD_PARSE_BYTES:
+            return await asyncio.to_thread(orjson.loads, body)
+        return orjson.loads(body)
 
     async def _post(self, path: str, data: dict = None):
-        resp = await self._client.post(f"{self._base}{path}", data=data)
+        resp = await self._request("POST", path, data=data)
+        # Any write may change torrent state: drop cached /torrents/info answers
+        self._info_cache.clear()
         resp.raise_for_status()
         return resp
 
@@ -87,17 +305,17 @@ class TorrentService:
         if tags:
             payload["tags"] = tags
 
-        resp = await self._post("/api/v2/torrents/add", data=payload)
+        resp = await self._post(self._PATH_ADD, data=payload)
         if resp.status_code == 200 and resp.text.strip() != "Fails.":
             logger.info(f"Magnet added: {magnet_link[:80]}…")
             return True
 
         # qBittorrent returns "Fails." when the torrent already exists in its list.
         # Verify by checking if the hash is already tracked.
-        if "xt=urn:btih:" in magnet_link:
+        torrent_hash = extract_infohash(magnet_link)
+        if torrent_hash:
             try:
-                torrent_hash = magnet_link.split("xt=urn:btih:")[1].split("&")[0].lower()
-                existing = await self._get("/api/v2/torrents/info", params={"hashes": torrent_hash})
+                existing = await self._get(self._PATH_INFO, params={"hashes": torrent_hash})
                 if existing:
                     logger.info(f"Torrent already in qBittorrent: {torrent_hash}")
                     return True
@@ -118,41 +336,58 @@ class TorrentService:
         Download a .torrent file from a URL and add it to qBittorrent.
         Returns the torrent hash on success, or None on failure.
         """
-        import hashlib
-        import bencodepy
-
-        # follow redirects manually to detect magnet:// redirects
+        # httpx follows the redirects; _magnet_redirect_hook short-circuits a
+        # hop to magnet:. The body is streamed so oversized responses are dropped early
+        magnet = None
         try:
-            resp = await self._client.get(torrent_url, follow_redirects=False, timeout=30)
-
-            # Follow redirects manually, checking for magnet links
-            max_redirects = 10
-            while resp.is_redirect and max_redirects > 0:
-                location = resp.headers.get("location", "")
-                if location.startswith("magnet:"):
-                    # Jackett redirected to a magnet link — use the magnet path
-                    logger.info(f"Torrent URL redirected to magnet, using add_magnet")
-                    success = await self.add_magnet(location, save_path, category, tags)
-                    if success and "xt=urn:btih:" in location:
-                        return location.split("xt=urn:btih:")[1].split("&")[0].lower()
-                    return None
-                resp = await self._client.get(location, follow_redirects=False, timeout=30)
-                max_redirects -= 1
-
-            resp.raise_for_status()
-            torrent_bytes = resp.content
+            async with self._client.stream("GET", torrent_url, follow_redirects=True, timeout=30) as resp:
+                resp.raise_for_status()
+                buf = bytearray()
+                async for chunk in resp.aiter_bytes(_DOWNLOAD_CHUNK):
+                    buf.extend(chunk)
+                    if len(buf) > _MAX_TORRENT_BYTES:
+                        raise ValueError(f".torrent exceeds {_MAX_TORRENT_BYTES} bytes")
+        except _MagnetRedirect as redirect:
+            magnet = redirect.location
         except Exception as e:
             logger.error(f"Failed to download .torrent from {torrent_url[:120]}: {e}")
             return None
 
+        if magnet is not None:
+            # Jackett redirected to a magnet link — use the magnet path
+            logger.info(f"Torrent URL redirected to magnet, using add_magnet")
+            success = await self.add_magnet(magnet, save_path, category, tags)
+            return extract_infohash(magnet) if success else None
+
+        torrent_bytes = bytes(buf)
+        del buf
+
         # Extract info_hash from torrent file
         try:
-            decoded = bencodepy.decode(torrent_bytes)
-            info = decoded[b"info"]
-            info_hash = hashlib.sha1(bencodepy.encode(info)).hexdigest().lower()
+            start, end = _info_span(torrent_bytes)
+            # Hash the slice in place (no copy); SHA-1 here is an identifier, not a security check
+            h = hashlib.sha1(usedforsecurity=False)
+            h.update(memoryview(torrent_bytes)[start:end])
+            info_hash = h.hexdigest().lower()
+        except (ValueError, KeyError, IndexError):
+            # Unusual layout: fall back to a full decode / re-encode
+            try:
+                import bencodepy
+                info = bencodepy.decode(torrent_bytes)[b"info"]
+                info_hash = hashlib.sha1(bencodepy.encode(info), usedforsecurity=False).hexdigest().lower()
+            except Exception as e:
+                logger.error(f"Failed to parse .torrent file: {e}")
+                return None
+
+        # Re-requests of the same film are common: skip the upload if qBittorrent
+        # already has it. Goes through list_torrents, so concurrent checks share
+        # one request and recent answers (hit or miss) are reused briefly.
+        try:
+            if await self.list_torrents(hashes=info_hash):
+                logger.info(f"Torrent already in qBittorrent: {info_hash}")
+                return info_hash
         except Exception as e:
-            logger.error(f"Failed to parse .torrent file: {e}")
-            return None
+            logger.warning(f"Could not check qBittorrent for {info_hash}, uploading anyway: {e}")
 
         # Upload via qBittorrent multipart API
         files = {"torrents": ("torrent.torrent", torrent_bytes, "application/x-bittorrent")}
@@ -167,17 +402,19 @@ class TorrentService:
             data["tags"] = tags
 
         try:
-            upload_resp = await self._client.post(
-                f"{self._base}/api/v2/torrents/add",
+            upload_resp = await self._request(
+                "POST",
+                self._PATH_ADD,
                 data=data,
                 files=files,
             )
+            self._info_cache.clear()
             if upload_resp.status_code == 200 and upload_resp.text.strip() != "Fails.":
                 logger.info(f"Torrent file added from URL, hash={info_hash}")
                 return info_hash
 
             # Might already exist
-            existing = await self._get("/api/v2/torrents/info", params={"hashes": info_hash})
+            existing = await self._get(self._PATH_INFO, params={"hashes": info_hash})
             if existing:
                 logger.info(f"Torrent already in qBittorrent: {info_hash}")
                 return info_hash
@@ -199,6 +436,10 @@ class TorrentService:
         """
         List torrents. `filter` can be: all, downloading, seeding, completed,
         paused, active, inactive, stalled, errored, etc.
+
+        Each torrent dict carries only the _TORRENT_FIELDS keys.
+        Answers are cached for _INFO_CACHE_TTL per parameter set, and concurrent
+        calls with the same parameters share a single request.
         """
         params = {"filter": filter, "sort": sort, "reverse": str(reverse).lower()}
         if category:
@@ -209,37 +450,51 @@ class TorrentService:
             params["offset"] = offset
         if hashes:
             params["hashes"] = hashes
-        return await self._get("/api/v2/torrents/info", params=params)
+
+        key = tuple(sorted(params.items()))
+        cached = self._info_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _INFO_CACHE_TTL:
+            return cached[1]
+
+        task = self._info_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_info(key, params))
+            self._info_inflight[key] = task
+            task.add_done_callback(lambda _: self._info_inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_info(self, key: tuple, params: dict) -> list[dict]:
+        """Fetch /torrents/info, trim it to _TORRENT_FIELDS and store it in the short-lived cache."""
+        raw = await self._get(self._PATH_INFO, params=params)
+        torrents = [{k: t[k] for k in _TORRENT_FIELDS if k in t} for t in raw]
+        now = time.monotonic()
+        # Drop expired entries so one-off hash filters don't pile up
+        self._info_cache = {
+            k: v for k, v in self._info_cache.items() if now - v[0] < _INFO_CACHE_TTL
+        }
+        self._info_cache[key] = (now, torrents)
+        return torrents
 
     async def get_torrent(self, torrent_hash: str) -> dict:
         """Get generic properties of a torrent."""
-        return await self._get("/api/v2/torrents/properties", params={"hash": torrent_hash})
+        return await self._get(self._PATH_PROPERTIES, params={"hash": torrent_hash})
 
     async def get_progress(self, torrent_hash: str) -> dict:
         """
         Convenience method: return hash, name, progress (0-1), state,
         download speed, eta, size.
         """
-        torrents = await self.list_torrents(hashes=torrent_hash)
-        if not torrents:
+        # Concurrent callers are batched into one hashes=a|b|c listing
+        t = await self._progress_batcher.get(torrent_hash.lower())
+        if t is None:
             return None
-        t = torrents[0]
-        return {
-            "hash": t["hash"],
-            "name": t["name"],
-            "progress": t["progress"],
-            "state": t["state"],
-            "dlspeed": t["dlspeed"],
-            "eta": t["eta"],
-            "size": t["size"],
-            "downloaded": t["downloaded"],
-            "save_path": t["save_path"],
-        }
+        # Already trimmed to _TORRENT_FIELDS; copy so callers can't alter the cache
+        return dict(t)
 
     async def get_files(self, torrent_hash: str) -> list[dict]:
         """List files inside a torrent.  Returns [] if the torrent no longer exists."""
         try:
-            return await self._get("/api/v2/torrents/files", params={"hash": torrent_hash})
+            return await self._get(self._PATH_FILES, params={"hash": torrent_hash})
         except httpx.HTTPStatusError as exc:
             if exc.response.status_code == 404:
                 logger.debug(f"Torrent {torrent_hash} not found in qBittorrent (already deleted?)")
@@ -248,23 +503,43 @@ class TorrentService:
 
     async def pause(self, torrent_hash: str):
         """Pause (stop) a torrent."""
-        await self._post("/api/v2/torrents/stop", data={"hashes": torrent_hash})
+        await self._post(self._PATH_STOP, data={"hashes": torrent_hash})
 
     async def resume(self, torrent_hash: str):
         """Resume (start) a torrent."""
-        await self._post("/api/v2/torrents/start", data={"hashes": torrent_hash})
+        await self._post(self._PATH_START, data={"hashes": torrent_hash})
 
     async def delete(self, torrent_hash: str, delete_files: bool = True):
         """Delete a torrent. By default also removes downloaded data."""
         await self._post(
-            "/api/v2/torrents/delete",
+            self._PATH_DELETE,
             data={"hashes": torrent_hash, "deleteFiles": str(delete_files).lower()},
         )
 
     async def recheck(self, torrent_hash: str):
         """Force recheck a torrent."""
-        await self._post("/api/v2/torrents/recheck", data={"hashes": torrent_hash})
+        await self._post(self._PATH_RECHECK, data={"hashes": torrent_hash})
 
     async def reannounce(self, torrent_hash: str):
         """Force reannounce a torrent to trackers."""
-        await self._post("/api/v2/torrents/reannounce", data={"hashes": torrent_hash})
+        await self._post(self._PATH_REANNOUNCE, data={"hashes": torrent_hash})
+
+
+# Process-wide instance, created on first use and closed on app shutdown.
+_service: Optional[TorrentService] = None
+
+
+def get_torrent_service() -> TorrentService:
+    """Return the shared TorrentService (usable as a FastAPI dependency)."""
+    global _service
+    if _service is None:
+        _service = TorrentService()
+    return _service
+
+
+async def close_torrent_service():
+    """Close the shared service's HTTP client (called on app shutdown)."""
+    global _service
+    if _service is not None:
+        await _service.aclose()
+        _service = None
@@ -1,41 +1,100 @@
-from datetime import datetime, timezone
+import hashlib
+import time
 from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, and_
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from cachetools import TTLCache
 
-from app.models.user import User
+from app.models.user import User, AuthProvider
 from app.schemas.user import (
     UserProfileUpdate,
+    UserProfileResponse,
     UserPublicProfile,
     UserPrivateProfile,
-    UserProfileResponse,
-    ProfileVisibility
+    ProfileVisibility,
+    CurrentUserClaims,
 )
 from app.config import settings, JWT_ALGORITHM
 from app.database import get_db
+from app.services.auth_service import AuthService
 
 security = HTTPBearer()
 
+# Detached User rows for get_cached_user, keyed by user id
+_USER_CACHE_SIZE = 10_000
+_USER_CACHE_TTL = 30 # seconds
+_user_cache: TTLCache = TTLCache(maxsize=_USER_CACHE_SIZE, ttl=_USER_CACHE_TTL)
+
+# Verified JWT claims keyed by sha256(token), to skip re-running jwt.decode.
+# Digests rather than raw tokens so the cache holds no usable credentials.
+_TOKEN_CACHE_SIZE = 50_000
+_TOKEN_CACHE_TTL = 60 # seconds; exp is re-checked on every hit anyway
+_token_cache: TTLCache = TTLCache(maxsize=_TOKEN_CACHE_SIZE, ttl=_TOKEN_CACHE_TTL)
+
+# Columns exposed by UserPublicProfile / UserPrivateProfile
+_PUBLIC_PROFILE_COLUMNS = (
+    User.id,
+    User.username,
+    User.first_name,
+    User.last_name,
+    User.profile_picture,
+    User.language,
+    User.created_at,
+)
+_PRIVATE_PROFILE_COLUMNS = _PUBLIC_PROFILE_COLUMNS + (
+    User.email,
+    User.auth_provider,
+    User.fortytwo_id,
+    User.github_id,
+    User.discord_id,
+    User.updated_at,
+)
+
+# Unique constraints on users: init.sql's inline UNIQUE names (users_*_key)
+# and the unique indexes create_all builds from the model (ix_users_*)
+_UNIQUE_VIOLATION_DETAILS = {
+    "users_username_key": "Username already taken",
+    "ix_users_username": "Username already taken",
+    "users_email_key": "Email already in use",
+    "ix_users_email": "Email already in use",
+}
+
 
 class UserService:
 
     @staticmethod
-    def verify_token(credentials: HTTPAuthorizationCredentials) -> UUID:
-        """Verify JWT token and return user_id"""
+    def decode_token(credentials: HTTPAuthorizationCredentials) -> dict:
+        """Verify JWT token and return its claims (guaranteed to carry 'sub')"""
+        token = credentials.credentials
+        key = hashlib.sha256(token.encode()).digest()
+        payload = _token_cache.get(key)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                return payload
+            _token_cache.pop(key, None)
         try:
-            token = credentials.credentials
+            # Cheap pre-check: expired or malformed tokens are rejected before any HMAC work
+            unverified = jwt.get_unverified_claims(token)
+            exp = unverified.get("exp")
+            if isinstance(exp, (int, float)) and exp < time.time():
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid token: Signature has expired."
+                )
             payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[JWT_ALGORITHM])
-            user_id = payload.get("sub")
-            if user_id is None:
+            if payload.get("sub") is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid token: no user ID"
                 )
-            return UUID(user_id)
+            if payload.get("exp") is not None:
+                _token_cache[key] = payload
+            return payload
         except JWTError as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,14 +102,31 @@ class UserService:
             )
 
     @staticmethod
-    async def get_current_user(
+    def verify_token(credentials: HTTPAuthorizationCredentials) -> UUID:
+        """Verify JWT token and return user_id"""
+        return UUID(UserService.decode_token(credentials)["sub"])
+
+    @staticmethod
+    async def get_current_user_claims(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+    ) -> CurrentUserClaims:
+        """Get current authenticated user from the token claims alone (no DB query)"""
+        # async although it never awaits: keeps FastAPI from running it in the
+        # threadpool, where it would touch the non-thread-safe _token_cache
+        payload = UserService.decode_token(credentials)
+        return CurrentUserClaims(id=UUID(payload["sub"]), username=payload.get("username"))
+
+    @staticmethod
+    async def get_current_user_db(
         credentials: HTTPAuthorizationCredentials = Depends(security),
         db: AsyncSession = Depends(get_db)
     ) -> User:
-        """Get current authenticated user from token"""
+        """
+        Get current authenticated user row from token, for endpoints that need
+        the full ORM object (served from the user cache, see get_cached_user).
+        """
         user_id = UserService.verify_token(credentials)
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await UserService.get_cached_user(db, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -58,6 +134,27 @@ class UserService:
             )
         return user
 
+    @staticmethod
+    async def get_cached_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+        """
+        Get a user by ID through the short-lived user cache. Cached rows are
+        detached copies, merged into `db` without a query so each request
+        gets its own session-bound instance.
+        """
+        cached = _user_cache.get(user_id)
+        if cached is None:
+            user = await db.get(User, user_id)
+            if not user:
+                return None
+            db.expunge(user)
+            _user_cache[user_id] = cached = user
+        return await db.merge(cached, load=False)
+
+    @staticmethod
+    def invalidate_cached_user(user_id: UUID):
+        """Drop a user from the get_current_user_db cache after it changes"""
+        _user_cache.pop(user_id, None)
+
     @staticmethod
     async def get_all_users(db: AsyncSession) -> list[dict]:
         """Get all users (id and username only), ordered alphabetically."""
@@ -67,38 +164,41 @@ class UserService:
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
         """Get user by ID"""
-        result = await db.execute(select(User).where(User.id == user_id))
-        return result.scalar_one_or_none()
+        return await db.get(User, user_id)
 
     @staticmethod
     async def get_profile_with_visibility(
         db: AsyncSession,
         target_user_id: UUID,
-        current_user: User
+        current_user: User | CurrentUserClaims
     ) -> UserProfileResponse:
         """Get user profile with appropriate visibility based on relationship"""
 
-        target_user = await UserService.get_user_by_id(db, target_user_id)
-        if not target_user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
         is_self = current_user.id == target_user_id
 
-        # Determine visibility level and return appropriate profile
+        # Determine visibility level and fetch only the columns it exposes
         if is_self:
             # User viewing their own profile - full access
-            profile = UserPrivateProfile.model_validate(target_user)
+            columns = _PRIVATE_PROFILE_COLUMNS
+            profile_model = UserPrivateProfile
             visibility = ProfileVisibility.PRIVATE
         else:
             # Random user - public access only
-            profile = UserPublicProfile.model_validate(target_user)
+            columns = _PUBLIC_PROFILE_COLUMNS
+            profile_model = UserPublicProfile
             visibility = ProfileVisibility.PUBLIC
 
-        return UserProfileResponse(
-            profile=profile.model_dump(),
+        result = await db.execute(select(*columns).where(User.id == target_user_id))
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+        # Server-side data, already in the schema's shape: skip validation
+        return UserProfileResponse.model_construct(
+            profile=profile_model.model_construct(**row._asdict()),
             visibility=visibility,
             is_self=is_self
         )
@@ -111,8 +211,6 @@ class UserService:
     ) -> User:
         """Update user profile"""
 
-        from app.models.user import AuthProvider
-
         # Only update fields that are provided
         if update_data.email is not None:
             if current_user.auth_provider != AuthProvider.EMAIL:
@@ -120,33 +218,9 @@ class UserService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email can only be changed for email-authenticated accounts"
                 )
-            result = await db.execute(
-                select(User).where(
-                    User.email == update_data.email,
-                    User.id != current_user.id
-                )
-            )
-            existing = result.scalar_one_or_none()
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already in use"
-                )
             current_user.email = update_data.email
 
         if update_data.username is not None:
-            result = await db.execute(
-                select(User).where(
-                    User.username == update_data.username,
-                    User.id != current_user.id
-                )
-            )
-            existing = result.scalar_one_or_none()
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Username already taken"
-                )
             current_user.username = update_data.username
 
         if update_data.first_name is not None:
@@ -161,9 +235,22 @@ class UserService:
         if update_data.profile_picture is not None:
             current_user.profile_picture = update_data.profile_picture
 
-        current_user.updated_at = datetime.now(timezone.utc)
-        await db.commit()
+        # Uniqueness is enforced by the email/username unique indexes
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            # asyncpg reports the violated constraint by name; anything else is not ours to map
+            driver_error = getattr(e.orig, "__cause__", None)
+            detail = _UNIQUE_VIOLATION_DETAILS.get(getattr(driver_error, "constraint_name", None))
+            if detail is None:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=detail
+            )
         await db.refresh(current_user)
+        UserService.invalidate_cached_user(current_user.id)
 
         return current_user
 
@@ -175,8 +262,6 @@ class UserService:
         new_password: str
     ) -> User:
         """Change user password (email auth only)"""
-        from app.models.user import AuthProvider
-        from app.services.auth_service import AuthService
 
         if current_user.auth_provider != AuthProvider.EMAIL:
             raise HTTPException(
@@ -191,9 +276,9 @@ class UserService:
             )
 
         current_user.password_hash = AuthService.hash_password(new_password)
-        current_user.updated_at = datetime.now(timezone.utc)
         await db.commit()
         await db.refresh(current_user)
+        UserService.invalidate_cached_user(current_user.id)
 
         return current_user
 
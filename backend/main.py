@@ -1,21 +1,42 @@
 import asyncio
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 
 from app.config import settings
 from app.database import engine, Base
 from app.routes import router as api_router
 from app.models import User, Download, Film, WatchedFilm
 from app.services.cleanup_service import periodic_cleanup_task
+from app.services.tmdb_service import get_tmdb_service, close_tmdb_service
+from app.services.torrent_service import get_torrent_service, close_torrent_service
+
+# pg_advisory_xact_lock key guarding schema creation at startup
+SCHEMA_LOCK_KEY = 742134
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables
+    # Startup: create tables. Workers starting together would race on the same
+    # CREATE TABLE / CREATE INDEX; the transaction-scoped advisory lock lets one
+    # worker build the schema while the others wait, then find it already there.
     async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
         await conn.run_sync(Base.metadata.create_all)
+        # create_all only builds indexes with new tables; add later ones to existing databases
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_watched_films_imdb_watched_at "
+            "ON watched_films (imdb_id, watched_at)"
+        ))
+
+    # Shared TMDB client: one rate limiter and cache for the whole app
+    get_tmdb_service()
+
+    # Shared qBittorrent client: one connection pool and session cookie
+    await get_torrent_service().startup()
 
     # Start periodic cleanup of stale torrents (unwatched for 30+ days)
     cleanup_task = asyncio.create_task(periodic_cleanup_task())
@@ -28,6 +49,8 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    await close_tmdb_service()
+    await close_torrent_service()
     await engine.dispose()
 
 
@@ -35,6 +58,7 @@ app = FastAPI(
     title="HyperTube",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -48,6 +72,13 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/v1")
 
 
-@app.get("/health")
-async def health_check():
-    return {"status": "ok"}
+# Probed constantly by load balancers: a plain Starlette route that hands back one
+# prebuilt response, skipping FastAPI's dependency and serialization machinery
+_HEALTH_RESPONSE = JSONResponse({"status": "ok"})
+
+
+async def health_check(request: Request) -> JSONResponse:
+    return _HEALTH_RESPONSE
+
+
+app.add_route("/health", health_check, methods=["GET"])
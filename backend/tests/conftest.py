@@ -0,0 +1,16 @@
+import os
+import sys
+
+# Tests import the backend as the app does (`from app...`), from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.config builds FRONT_URL from HOST_IP at import time, and Settings() rejects
+# the None it gets for these unset str settings, so give them test placeholders
+os.environ.setdefault("HOST_IP", "localhost")
+for _name in (
+    "SMTP_HOST", "SMTP_USER", "SMTP_PASSWORD", "MAIL_FROM",
+    "FORTYTWO_UID", "FORTYTWO_SECRET",
+    "GITHUB_UID", "GITHUB_SECRET",
+    "DISCORD_UID", "DISCORD_SECRET",
+):
+    os.environ.setdefault(_name, "test")
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services.cleanup_service import (
+    CLEANUP_INTERVAL_SECONDS,
+    CLEANUP_MIN_DELAY_SECONDS,
+    _as_utc,
+    _next_check_delay,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_as_utc_treats_naive_timestamps_as_utc():
+    naive = datetime(2026, 1, 1, 12, 0)
+    assert _as_utc(naive) == NOW
+    assert _as_utc(NOW) is NOW
+
+
+def test_next_check_delay_accepts_naive_due_time():
+    # TIMESTAMP columns from init.sql come back naive from asyncpg
+    naive_due = (NOW + timedelta(hours=5)).replace(tzinfo=None)
+    assert _next_check_delay(naive_due, NOW) == 5 * 3600
+
+
+def test_next_check_delay_is_clamped():
+    assert _next_check_delay(None, NOW) == CLEANUP_INTERVAL_SECONDS
+    assert _next_check_delay(NOW - timedelta(days=3), NOW) == CLEANUP_MIN_DELAY_SECONDS
+    assert _next_check_delay(NOW + timedelta(days=10), NOW) == CLEANUP_INTERVAL_SECONDS
@@ -0,0 +1,33 @@
+import hashlib
+
+import pytest
+
+from app.services.torrent_service import _bencode_skip, _info_span
+
+
+def test_info_span_returns_raw_info_dict():
+    info = b"d6:lengthi5e4:name1:xe"
+    data = b"d8:announce3:abc4:info" + info + b"e"
+    start, end = _info_span(data)
+    assert data[start:end] == info
+    assert hashlib.sha1(data[start:end]).hexdigest() == hashlib.sha1(info).hexdigest()
+
+
+def test_bencode_skip_handles_deep_nesting():
+    depth = 100_000  # far past the interpreter's recursion limit
+    value = b"l" * depth + b"e" * depth
+    data = b"d4:info" + value + b"e"
+    assert _bencode_skip(value, 0) == len(value)
+    start, end = _info_span(data)
+    assert data[start:end] == value
+
+
+@pytest.mark.parametrize("data", [
+    b"d4:info" + b"l" * 100_000,  # unterminated deep nesting
+    b"d4:infox",                  # invalid token
+    b"e",                         # not a dict
+    b"d4:info10:abce",            # truncated string
+])
+def test_info_span_rejects_malformed_input(data):
+    with pytest.raises((ValueError, KeyError, IndexError)):
+        _info_span(data)
@@ -1,8 +1,29 @@
 #!/usr/bin/env python3
-"""Generate a qBittorrent PBKDF2 password hash from a plaintext password."""
+"""
+Generate a qBittorrent PBKDF2 password hash from a plaintext password.
+
+QBT_KDF selects the key derivation function:
+  pbkdf2 (default)  PBKDF2-HMAC-SHA512, the only scheme qBittorrent verifies today.
+  scrypt            Memory-hard scrypt (n=2**15, r=8, p=1), same output format.
+                    qBittorrent cannot check it yet: only switch once the WebUI
+                    gains scrypt/argon2 support, by setting QBT_KDF=scrypt for
+                    init-credentials.sh and restarting the container.
+"""
 import hashlib, os, base64, sys
 
+# qBittorrent verifies WebUI\Password_PBKDF2 with a fixed 100000 iterations and
+# stores no iteration count in the "@ByteArray(salt:key)" value, so any other
+# count locks the WebUI out. Only override for a build that verifies with it.
+ITERATIONS = int(os.environ.get("QBT_PBKDF2_ITERS", "100000"))
+KDF = os.environ.get("QBT_KDF", "pbkdf2").lower()
+
 password = sys.argv[1] if len(sys.argv) > 1 else "adminadmin"
 salt = os.urandom(16)
-key = hashlib.pbkdf2_hmac("sha512", password.encode(), salt, 100000, dklen=64)
+if KDF == "scrypt":
+    # 128 * r * n = 32 MiB of working memory, past the default 32 MiB maxmem cap
+    key = hashlib.scrypt(password.encode(), salt=salt, n=2**15, r=8, p=1, maxmem=64 * 1024 * 1024, dklen=64)
+elif KDF == "pbkdf2":
+    key = hashlib.pbkdf2_hmac("sha512", password.encode(), salt, ITERATIONS, dklen=64)
+else:
+    sys.exit(f"Unknown QBT_KDF: {KDF!r} (expected pbkdf2 or scrypt)")
 print(f'"@ByteArray({base64.b64encode(salt).decode()}:{base64.b64encode(key).decode()})"')